@@ -1,166 +1,331 @@
-import sys
-from math import sqrt
-from time import sleep
-
-import pygame as pg
-from pygame import mixer
-
-from aliens import AlienFleet
-from collision_handler import CollisionHandler
-from constants import FPS
-from demo import Demo
-from screen import Display
-from event_handler import EventHandler
-from game_stats import GameStats
-from projectiles import ProjectileHandler
-from scoreboard import Scoreboard
-from settings import Settings
-from ship import Ship
-
-
-class AlienInvasion:
-    """Overall class to manage game assets and behavior."""
-
-    def __init__(self):
-        """Initialize the game, and create game resources."""
-        # Initialize pygame settings
-        mixer.pre_init(44100, -16, 2, 2048)
-        mixer.init()
-        pg.init()
-
-        # Create a clock to cap fps
-        self.clock = pg.time.Clock()
-
-        # Initialize game settings and display
-        self.settings = Settings()
-        self.display = Display(self)
-
-        # Create groups to hold bullets, aliens, and explosions
-        self.ship_bullets = pg.sprite.Group()
-        self.alien_bullets = pg.sprite.Group()
-        self.aliens = pg.sprite.Group()
-        self.explosions = pg.sprite.Group()
-
-        # Create an instance to store game statistics, create scoreboard and player ship.
-        self.stats = GameStats(self)
-        self.sb = Scoreboard(self)
-        self.ship = Ship(self)
-
-        # Initialize the rest of the display settings and create the initial fleet to display
-        self.display.initialize_object_attributes(self)
-        self.fleet = AlienFleet(self)
-
-        # Create buttons to select difficulty setting
-        self.buttons = self.display.create_buttons()
-
-        # Create objects to handle events, projectiles, and collisions
-        self.event = EventHandler(self)
-        self.projectile = ProjectileHandler(self)
-        self.collision = CollisionHandler(self)
-        self.demo = Demo(self)
-
-        # Create game over message
-        self.display.create_game_over_msg()
-
-        # Load game start, game over, and background sounds
-        self.game_start_sound = mixer.Sound('sound_effects/game_start.wav')
-        self.game_over_sound = mixer.Sound('sound_effects/game_over.wav')
-
-    def run_game(self):
-        """Start the main loop for the game."""
-        while True:
-            # Check for and respond to keypresses and mouse clicks
-            self.event.check_events()
-
-            if self.stats.game_active:
-                self.ship.update()
-                self.projectile.update()
-                self.fleet.update()
-                self.explosions.update()
-
-            self.display.update_screen(self)
-
-            # Start a new level if there are no aliens
-            if not self.aliens:
-                self.start_new_level()
-
-            # Cap fps at 30 frames per second
-            time_passed = self.clock.tick(FPS)
-
-    def start_game(self):
-        """Start game play."""
-        # Reset the game statistics.
-        self.stats.reset_stats()
-        self.stats.game_active = True
-        self.stats.game_over = False
-        self.sb.prep_images()
-
-        # Get rid of any remaining aliens, bullets, and explosions.
-        self.aliens.empty()
-        self.ship_bullets.empty()
-        self.alien_bullets.empty()
-        self.explosions.empty()
-
-        # Create a new fleet and center the ship.
-        AlienFleet(self)
-        self.ship.center_ship()
-
-        # Hide the mouse cursor.
-        pg.mouse.set_visible(False)
-
-        # Play the game start sound
-        self.game_start_sound.play()
-        sleep(0.5)
-
-    def reset_level(self):
-        """Reset the current level (occurs when aliens make it to/past the ship)."""
-        # Get rid of any remaining aliens, bullets, and explosions.
-        self.aliens.empty()
-        self.ship_bullets.empty()
-        self.alien_bullets.empty()
-        self.explosions.empty()
-
-        # Create a new fleet and center the ship.
-        AlienFleet(self)
-        self.ship.center_ship()
-
-    def start_new_level(self):
-        """Start a new level."""
-        # Destroy existing bullets and explosions and create new fleet.
-        self.ship_bullets.empty()
-        self.alien_bullets.empty()
-        self.explosions.empty()
-        AlienFleet(self)
-        # Increase game speed if level less than 11 (10 speed increases total)
-        if self.stats.level < 11:
-            self.settings.increase_speed()
-
-        # Increase level
-        self.stats.level += 1
-        self.sb.prep_level()
-
-    def game_over(self):
-        """End game play."""
-        self.stats.game_active = False
-        self.stats.game_over = True
-        self.settings.initialize_dynamic_settings()
-        self.game_over_sound.play()
-        sleep(0.5)
-        pg.mouse.set_visible(True)
-
-    def quit(self):
-        """Exit the game."""
-        self.sb.record_high_score()
-        sys.exit()
-
-
-def main():
-    # Make a game instance, and run the game.
-    ai = AlienInvasion()
-    ai.display.create_start_screen()
-    ai.display.display_start_screen(ai.demo)
-    ai.run_game()
-
-
-if __name__ == "__main__":
-    main()
+import argparse
+import json
+import os
+import random
+import sys
+from math import ceil, sqrt
+from time import perf_counter
+
+import pygame as pg
+from pygame import mixer
+
+from aliens import AlienFleet
+from array_fleet import ArrayAlienFleet
+from assets import AssetCache
+from collision_handler import CollisionHandler
+from constants import FPS, GAME_OVER, GAME_OVER_PAUSE, RESPAWNING, START_PAUSE, STARTING
+from demo import Demo
+from screen import Display
+from event_handler import EventHandler
+from game_stats import GameStats
+from leaderboard import Leaderboard
+from profiler import Profiler
+from projectiles import ProjectileHandler
+from replay import Recorder, Replay
+from scoreboard import Scoreboard
+from timeline import FixedTimestep, Timeline
+from settings import Settings
+from ship import Ship
+from sounds import SoundManager
+
+
+class AlienInvasion:
+    """Overall class to manage game assets and behavior."""
+
+    def __init__(self, headless=False, settings=None, seed=None):
+        """Initialize the game, and create game resources."""
+        # Time from here to the first frame is reported at startup
+        self.launch_time = perf_counter()
+
+        # A headless game has no window, no audio, and no frame pacing. It is advanced with step().
+        self.headless = headless
+
+        # All gameplay randomness comes from one seeded generator so sessions can be replayed
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+
+        # Count every simulation tick, and record input if the session is being recorded
+        self.tick_count = 0
+        self.recorder = None
+
+        # Initialize pygame settings
+        if self.headless:
+            # Only initialize the modules needed to simulate the game (fonts are used by the scoreboard)
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            pg.display.init()
+            pg.font.init()
+        else:
+            mixer.pre_init(44100, -16, 2, 2048)
+            mixer.init()
+            pg.init()
+
+        # Initialize game settings and display
+        self.settings = settings or Settings()
+        self.display = Display(self)
+
+        # Create a clock to cap fps, and a fixed timestep so the game runs at the same speed at any fps
+        self.clock = pg.time.Clock()
+        self.timestep = FixedTimestep(self.clock, self.settings.render_fps)
+
+        # Create the timeline that all animation and effect timing is measured against
+        self.timeline = Timeline()
+
+        # Create a cache so images and sounds are only loaded (and scaled) once
+        self.assets = AssetCache()
+
+        # Create the sound manager that plays every sound effect (silently, if the mixer isn't running)
+        self.sounds = SoundManager(self)
+
+        # Create the profiler that times each phase of every frame (it does nothing while it's off)
+        self.profiler = Profiler(self)
+
+        # Create groups to hold bullets, aliens, and explosions
+        self.ship_bullets = pg.sprite.Group()
+        self.alien_bullets = pg.sprite.Group()
+        self.aliens = pg.sprite.Group()
+        self.explosions = pg.sprite.Group()
+
+        # Load the leaderboard of past runs (the high score comes from it)
+        self.leaderboard = Leaderboard(self)
+
+        # Create an instance to store game statistics, create scoreboard and player ship.
+        self.stats = GameStats(self)
+        self.sb = Scoreboard(self)
+        self.ship = Ship(self)
+
+        # Initialize the rest of the display settings
+        self.display.initialize_object_attributes(self)
+
+        # Create objects to handle events, projectiles, and collisions
+        self.event = EventHandler(self)
+        self.projectile = ProjectileHandler(self)
+        self.collision = CollisionHandler(self)
+
+        # Create the initial fleet to display
+        if self.settings.array_fleet:
+            self.fleet = ArrayAlienFleet(self)
+        else:
+            self.fleet = AlienFleet(self)
+
+        # Create buttons to select difficulty setting
+        self.buttons = self.display.create_buttons()
+
+        self.demo = Demo(self)
+
+        # Create game over message
+        self.display.create_game_over_msg()
+
+    def run_game(self):
+        """Start the main loop for the game."""
+        while True:
+            self.profiler.begin_frame()
+
+            # Check for and respond to keypresses and mouse clicks
+            with self.profiler.phase('input'):
+                self.event.check_events()
+
+            # Wait for the next frame, then run however many simulation ticks are due
+            with self.profiler.phase('wait'):
+                ticks = self.timestep.tick()
+            for _ in range(ticks):
+                self.display.store_positions()
+                self.update_game()
+
+            with self.profiler.phase('render'):
+                self.display.update_screen(self, self.timestep.get_alpha())
+
+            # Finish any loading that was left for the background (e.g. if the start screen was skipped)
+            if self.assets.pending:
+                self.assets.load_pending()
+            self.profiler.end_frame()
+
+    def step(self, inputs=()):
+        """
+        Advance the game by a single frame without drawing anything or waiting on the clock.
+          inputs is a sequence of pygame events handled exactly as if they came from the event queue.
+        """
+        for event in inputs:
+            self.event.handle_event(event)
+
+        self.update_game()
+
+    def update_game(self):
+        """Update the ship, projectiles, aliens, and explosions by one simulation tick."""
+        self.tick_count += 1
+
+        # Gameplay is suspended while paused
+        if self.stats.pause_state:
+            self.stats.pause_ticks -= 1
+            if self.stats.pause_ticks <= 0:
+                self._end_pause()
+        else:
+            if self.stats.game_active:
+                self.timeline.advance()
+                with self.profiler.phase('ship'):
+                    self.ship.update()
+                with self.profiler.phase('projectiles'):
+                    self.projectile.update()
+                with self.profiler.phase('fleet'):
+                    self.fleet.update()
+                with self.profiler.phase('explosions'):
+                    self.explosions.update()
+
+            # Start a new level if there are no aliens
+            if not self.aliens:
+                self.start_new_level()
+
+        if self.recorder:
+            self.recorder.record_tick()
+
+    def pause(self, state, duration):
+        """Suspend gameplay in state for duration milliseconds without blocking the main loop."""
+        self.stats.pause_state = state
+        self.stats.pause_ticks = ceil(duration * FPS / 1000)
+        if self.settings.skip_pauses:
+            self._end_pause()
+
+    def is_paused(self):
+        """Return True if gameplay is suspended."""
+        return self.stats.pause_state is not None
+
+    def cancel_pause(self):
+        """Leave the current pause without carrying out what was waiting on it."""
+        self.stats.pause_state = None
+        self.stats.pause_ticks = 0
+
+    def _end_pause(self):
+        """Leave the current pause and carry out whatever was waiting on it."""
+        state = self.stats.pause_state
+        self.cancel_pause()
+
+        if state == RESPAWNING:
+            self.reset_level()
+        elif state == GAME_OVER:
+            pg.mouse.set_visible(True)
+
+    def start_game(self):
+        """Start game play."""
+        # Reset the game statistics.
+        self.stats.reset_stats()
+        self.stats.game_active = True
+        self.stats.game_over = False
+        self.sb.prep_images()
+
+        # Get rid of any remaining aliens, bullets, and explosions.
+        self.aliens.empty()
+        self.ship_bullets.empty()
+        self.alien_bullets.empty()
+        self.explosions.empty()
+
+        # Create a new fleet and center the ship.
+        self.fleet.create_fleet()
+        self.ship.center_ship()
+        self.display.request_full_redraw()
+
+        # Hide the mouse cursor.
+        pg.mouse.set_visible(False)
+
+        # Play the game start sound and give the player a moment before the aliens start moving
+        self.sounds.play('game_start')
+        self.pause(STARTING, START_PAUSE)
+
+    def reset_level(self):
+        """Reset the current level (occurs when aliens make it to/past the ship)."""
+        # Get rid of any remaining aliens, bullets, and explosions.
+        self.aliens.empty()
+        self.ship_bullets.empty()
+        self.alien_bullets.empty()
+        self.explosions.empty()
+
+        # Create a new fleet and center the ship.
+        self.fleet.create_fleet()
+        self.ship.center_ship()
+        self.display.request_full_redraw()
+
+    def start_new_level(self):
+        """Start a new level."""
+        # Destroy existing bullets and explosions and create new fleet.
+        self.ship_bullets.empty()
+        self.alien_bullets.empty()
+        self.explosions.empty()
+        self.fleet.create_fleet()
+        self.display.request_full_redraw()
+        # Increase game speed if level less than 11 (10 speed increases total)
+        if self.stats.level < 11:
+            self.settings.increase_speed()
+
+        # Increase level
+        self.stats.level += 1
+        self.sb.prep_level()
+
+    def game_over(self):
+        """End game play."""
+        self.stats.game_active = False
+        self.stats.game_over = True
+        self.settings.initialize_dynamic_settings()
+        self.display.request_full_redraw()
+        self.sounds.play('game_over')
+        self.leaderboard.add_run()
+        # Hold off on showing the mouse (and accepting input to start a new game) for a moment
+        self.pause(GAME_OVER, GAME_OVER_PAUSE)
+
+    def record(self, path):
+        """Record the input for the rest of the session (and periodic checksums) to a replay file."""
+        self.recorder = Recorder(self, path)
+
+    def quit(self):
+        """Exit the game."""
+        if self.recorder:
+            self.recorder.close()
+        if self.profiler.trace_path:
+            self.profiler.export_trace(self.profiler.trace_path)
+        # A game still in progress counts as a finished run
+        if self.stats.game_active and not self.stats.game_demo:
+            self.leaderboard.add_run()
+        self.leaderboard.close()
+        sys.exit()
+
+
+def _parse_resolution(text):
+    """Parse WIDTHxHEIGHT into a (width, height) pair."""
+    try:
+        width, height = (int(size) for size in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' isn't WIDTHxHEIGHT")
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alien Invasion")
+    parser.add_argument('--record', metavar='FILE',
+                        help="record this session to a replay file (skips the start screen)")
+    parser.add_argument('--replay', metavar='FILE',
+                        help="play a replay file back headless as fast as possible and verify it")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="start with the profiler on, and write a Chrome trace file when the game quits")
+    parser.add_argument('--render-resolution', metavar='WIDTHxHEIGHT', type=_parse_resolution,
+                        help="draw at a fixed resolution (e.g. 1280x720) and scale each frame up to the screen")
+    args = parser.parse_args()
+
+    if args.replay:
+        report = Replay(args.replay).run(AlienInvasion, Settings())
+        print(json.dumps(report, indent=2))
+        sys.exit(1 if report['mismatches'] else 0)
+
+    # Make a game instance, and run the game.
+    settings = Settings()
+    settings.profiling = bool(args.profile)
+    settings.render_resolution = args.render_resolution
+    ai = AlienInvasion(settings=settings)
+    ai.profiler.trace_path = args.profile
+    if args.record:
+        # Recordings start from a freshly created game, so skip the start screen (and its demo)
+        ai.record(args.record)
+    else:
+        ai.display.create_start_screen()
+        ai.display.display_start_screen(ai.demo)
+    ai.run_game()
+
+
+if __name__ == "__main__":
+    main()
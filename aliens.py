@@ -1,173 +1,326 @@
-from random import choice
-
-import pygame as pg
-from pygame import mixer
-from pygame.sprite import Sprite
-
-from constants import ALIEN_IMG_1, ALIEN_IMG_2, ALIEN_IMG_PANEL_DURATION, ELEMENT_SPACING
-from projectiles import AlienBullet
-
-
-class Alien(Sprite):
-    """A class to represent a single alien in the fleet."""
-
-    def __init__(self, ai_game):
-        """Initialize the alien and set its starting position."""
-        super().__init__()
-
-        # AlienInvasion attributes the Alien class methods need access to.
-        self.ai_game = ai_game
-        self.settings = ai_game.settings
-        self.display = ai_game.display
-        self.screen_rect = self.display.screen.get_rect()
-        self.alien_bullets = self.ai_game.alien_bullets
-        self.aliens = self.ai_game.aliens
-
-        # Load alien sound effects
-        self.alien_bullet_sound = mixer.Sound('sound_effects/laser.wav')
-
-        # Load the alien images (two panel animation)
-        self.images = []
-        self.images.append(ALIEN_IMG_1)
-        self.images.append(ALIEN_IMG_2)
-
-        # Scale the images if necessary based on screen size and set rect attribute
-        if self.display.scale_factor != 1:
-            self._scale_alien()
-        else:
-            self.rect = self.images[0].get_rect()
-
-        # Set the first image to use
-        self.index = 0
-        self.image = self.images[self.index]
-
-        # Initialize variable to track time to determine when to switch between images
-        self.clock = pg.time.Clock()
-        self.elapsed = 0
-
-        # Start each new alien near the top left of the screen.
-        self.rect.x = self.rect.width
-        self.rect.y = self.rect.height
-
-        # Store the alien's exact position.
-        self.x = float(self.rect.x)
-        self.y = float(self.rect.y)
-
-    def _scale_alien(self):
-        """Scale the aliens size based on screen size."""
-        width = int(self.images[0].get_rect().width *
-                    self.display.scale_factor)
-        height = int(self.images[0].get_rect().height *
-                     self.display.scale_factor)
-        for i in range(len(self.images)):
-            self.images[i] = pg.transform.scale(
-                self.images[i], (width, height))
-        self.rect = self.images[0].get_rect()
-
-    def check_edges(self):
-        """Return True if alien is at edge of screen."""
-        if self.rect.right >= self.screen_rect.right or self.rect.left <= 0:
-            return True
-
-    def update(self):
-        """Move the alien right or left, update image, and fire bullets."""
-        # Update the aliens horizontal position
-        self.x += (self.settings.alien_speed *
-                   self.settings.fleet_direction)
-        self.rect.x = self.x
-
-        # Increment time elapsed by time since method was last called
-        self.elapsed += self.clock.tick()
-
-        # Change alien image to next panel if enough time has elapsed
-        if self.elapsed >= ALIEN_IMG_PANEL_DURATION:
-            self.index += 1
-            if self.index >= len(self.images):
-                self.index = 0
-            self.image = self.images[self.index]
-            self.elapsed = 0
-
-        # Attempt to fire a bullet
-        self.fire_bullet()
-
-    def fire_bullet(self):
-        """Create a new bullet and add it to the alien bullets group."""
-        if len(self.alien_bullets) < self.settings.alien_bullets_allowed:
-            new_bullet = AlienBullet(
-                self.ai_game, choice(self.aliens.sprites()))
-            self.alien_bullets.add(new_bullet)
-            self.alien_bullet_sound.play()
-
-
-class AlienFleet():
-    """A class to manage an alien fleet."""
-
-    def __init__(self, ai_game):
-        """Initialize an alien fleet."""
-        # AlienInvasion attributes the AlienFleet class methods need access to
-        self.ai_game = ai_game
-        self.settings = ai_game.settings
-        self.ship = ai_game.ship
-        self.aliens = ai_game.aliens
-
-        # Create an alien and find the number of aliens in a row.
-        alien = Alien(ai_game)
-        alien_width, alien_height = alien.rect.size
-        # Leave a gap so alien fleet has some room for horizontal movement
-        available_space_x = self.settings.screen_width - \
-            (ELEMENT_SPACING * alien_width)
-        # Number of aliens in row depends on gap defined above and spacing between aliens
-        number_aliens_x = available_space_x // (ELEMENT_SPACING * alien_width)
-
-        # Determine the number of rows of aliens that fit on the screen.
-        ship_height = self.ship.rect.height
-        # Account for the height of the ship
-        available_space_y = (self.settings.screen_height -
-                             ((ELEMENT_SPACING) * alien_height) - ship_height)
-        # Leave a reasonable space between the bottom row of aliens and the ship
-        number_rows = available_space_y // (
-            (ELEMENT_SPACING ** 2) * alien_height)
-
-        # Create the full fleet of aliens
-        for row_number in range(number_rows):
-            for alien_number in range(number_aliens_x):
-                self._create_alien(alien_number, row_number, ai_game)
-
-    def _create_alien(self, alien_number, row_number, ai_game):
-        """Create an alien and place it in the row."""
-        alien = Alien(ai_game)
-        alien_width, alien_height = alien.rect.size
-        alien.x = alien_width * (1 + ELEMENT_SPACING * alien_number)
-        alien.rect.x = alien.x
-
-        # Ensure top row of aliens is below scoreboard (scoreboard is approximately 2.5 times alien height)
-        alien.y = alien_height * (2.5 + ELEMENT_SPACING * row_number)
-        alien.rect.y = alien.y
-        self.aliens.add(alien)
-
-    def update(self):
-        """
-        Check if the fleet is at an edge, 
-          then update the positions of all aliens in the fleet.
-        """
-        self._check_fleet_edges()
-        self.aliens.update()
-
-        # Look for alien-ship collisions.
-        self.ai_game.collision.check_alien_ship_collisions()
-
-        # Look for aliens hitting the bottom of the screen.
-        self.ai_game.collision.check_aliens_bottom()
-
-    def _check_fleet_edges(self):
-        """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
-
-    def _change_fleet_direction(self):
-        """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
-        self.settings.fleet_direction *= -1
+import pygame as pg
+from pygame.sprite import Sprite
+
+from constants import ALIEN_IMG_1, ALIEN_IMG_2, ALIEN_IMG_PANEL_DURATION, ELEMENT_SPACING, FLEET_PREBUILD_PER_TICK
+
+
+class Alien(Sprite):
+    """A class to represent a single alien in the fleet."""
+
+    def __init__(self, ai_game):
+        """Initialize the alien and set its starting position."""
+        super().__init__()
+
+        # AlienInvasion attributes the Alien class methods need access to.
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.display = ai_game.display
+
+        # Get the alien images (two panel animation) scaled based on screen size and set rect attribute
+        self.images = [ai_game.assets.image(ALIEN_IMG_1, self.display.scale_factor),
+                       ai_game.assets.image(ALIEN_IMG_2, self.display.scale_factor)]
+        self.rect = self.images[0].get_rect()
+
+        # Set the first image to use (the fleet switches images for every alien at once)
+        self.image = self.images[0]
+
+        # Start each new alien near the top left of the screen.
+        self.rect.x = self.rect.width
+        self.rect.y = self.rect.height
+
+        # Store the alien's exact position.
+        self.x = float(self.rect.x)
+        self.y = float(self.rect.y)
+
+        # The fleet, column, and row the alien belongs to (set when the fleet places it)
+        self.fleet = None
+        self.column = None
+        self.row = None
+
+    def kill(self):
+        """Remove the alien from all groups and from its fleet's bounding box."""
+        # groupcollide calls kill() on the aliens it removes
+        if self.fleet and self.alive():
+            self.fleet.remove_alien(self)
+        super().kill()
+
+    def update(self):
+        """Move the alien right or left."""
+        # Update the aliens horizontal position
+        self.x += (self.settings.alien_speed *
+                   self.settings.fleet_direction)
+        self.rect.x = self.x
+
+
+class AlienFleet():
+    """A class to manage an alien fleet."""
+
+    def __init__(self, ai_game):
+        """Initialize an alien fleet."""
+        # AlienInvasion attributes the AlienFleet class methods need access to
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.ship = ai_game.ship
+        self.aliens = ai_game.aliens
+        self.alien_bullets = ai_game.alien_bullets
+        self.screen_rect = ai_game.display.screen.get_rect()
+        self.timeline = ai_game.timeline
+        self.rng = ai_game.rng
+        self.sounds = ai_game.sounds
+
+        # The whole fleet shares one set of animation images
+        self.images = [ai_game.assets.image(ALIEN_IMG_1, ai_game.display.scale_factor),
+                       ai_game.assets.image(ALIEN_IMG_2, ai_game.display.scale_factor)]
+
+        # Fleet layouts (see _get_layout), keyed by screen size, alien and ship sizes, and fleet size
+        self.layouts = {}
+
+        # The aliens of the next fleet, built a few at a time while the current level plays (and the layout
+        # they were built for)
+        self.next_fleet = []
+        self.next_fleet_layout = None
+
+        # Create the initial fleet
+        self.create_fleet()
+
+    def create_fleet(self):
+        """Add a full fleet of aliens (prepared ahead of time, as far as possible) to the aliens group."""
+        layout = self._get_layout()
+        number_aliens_x, number_rows, self.spacing_x, self.spacing_y, positions = layout
+        self._reset_bounds(number_aliens_x, number_rows)
+        self._reset_animation()
+        aliens = self._take_next_fleet(layout)
+        for alien, (column, row, _, _) in zip(aliens, positions):
+            self._track_alien(alien, column, row)
+        self.aliens.add(aliens)
+        self.ai_game.collision.build_alien_grid()
+
+    def prepare_next_fleet(self, count=FLEET_PREBUILD_PER_TICK):
+        """Build up to count more aliens of the next fleet (called every tick, so it's ready when it's needed)."""
+        layout = self._get_layout()
+        if layout is not self.next_fleet_layout:
+            self.next_fleet = []
+            self.next_fleet_layout = layout
+        first = len(self.next_fleet)
+        for slot in range(first, min(first + count, len(layout[4]))):
+            self.next_fleet.append(self._create_alien(slot))
+
+    def _take_next_fleet(self, layout):
+        """Return the aliens of the next fleet, finishing any that weren't built yet."""
+        self.prepare_next_fleet(len(layout[4]))
+        aliens, self.next_fleet = self.next_fleet, []
+        return aliens
+
+    def _get_layout(self):
+        """
+        Return the fleet layout for the current screen, only working it out the first time.
+          The layout is (columns, rows, spacing_x, spacing_y, positions): the number of columns and rows, the
+          spacing between them (in alien sizes), and each alien's (column, row, x, y) in the order they're added.
+        """
+        # Every alien is the size of the fleet's images
+        alien_width, alien_height = self.images[0].get_size()
+        ship_height = self.ship.rect.height
+        key = (self.settings.screen_width, self.settings.screen_height, alien_width, alien_height, ship_height,
+               self.settings.fleet_size)
+        layout = self.layouts.get(key)
+        if layout is not None:
+            return layout
+
+        # Find the number of aliens in a row.
+        # Leave a gap so alien fleet has some room for horizontal movement
+        available_space_x = self.settings.screen_width - \
+            (ELEMENT_SPACING * alien_width)
+        # Number of aliens in row depends on gap defined above and spacing between aliens
+        number_aliens_x = available_space_x // (ELEMENT_SPACING * alien_width)
+
+        # Determine the number of rows of aliens that fit on the screen.
+        # Account for the height of the ship
+        available_space_y = (self.settings.screen_height -
+                             ((ELEMENT_SPACING) * alien_height) - ship_height)
+        # Leave a reasonable space between the bottom row of aliens and the ship
+        number_rows = available_space_y // (
+            (ELEMENT_SPACING ** 2) * alien_height)
+
+        spacing_x = spacing_y = ELEMENT_SPACING
+        if self.settings.fleet_size:
+            # Squeeze a larger fleet into the area a normal fleet covers (aliens may overlap)
+            columns, rows = self.settings.fleet_size
+            spacing_x = min(ELEMENT_SPACING, ELEMENT_SPACING * (number_aliens_x - 1) / max(columns - 1, 1))
+            spacing_y = min(ELEMENT_SPACING, ELEMENT_SPACING * (number_rows - 1) / max(rows - 1, 1))
+            number_aliens_x, number_rows = columns, rows
+
+        positions = []
+        for row_number in range(number_rows):
+            # Ensure top row of aliens is below scoreboard (scoreboard is approximately 2.5 times alien height)
+            y = alien_height * (2.5 + spacing_y * row_number)
+            for alien_number in range(number_aliens_x):
+                x = alien_width * (1 + spacing_x * alien_number)
+                positions.append((alien_number, row_number, x, y))
+        layout = self.layouts[key] = (number_aliens_x, number_rows, spacing_x, spacing_y, positions)
+        return layout
+
+    def _create_alien(self, slot):
+        """Create the alien for a slot in the next fleet's layout, at its starting position."""
+        _, _, x, y = self.next_fleet_layout[4][slot]
+        alien = Alien(self.ai_game)
+        alien.x = x
+        alien.rect.x = alien.x
+        alien.y = y
+        alien.rect.y = alien.y
+        return alien
+
+    def _reset_bounds(self, number_aliens_x, number_rows):
+        """Set up empty columns and rows for a new fleet."""
+        # Every alien in a column moves identically, as does every alien in a row, so any one of them
+        # gives the extent of its column or row. The fleet's bounding box comes from the outermost
+        # columns and rows that still have aliens in them.
+        self.columns = [set() for _ in range(number_aliens_x)]
+        self.rows = [set() for _ in range(number_rows)]
+        self.first_column, self.last_column = 0, number_aliens_x - 1
+        self.first_row, self.last_row = 0, number_rows - 1
+
+        # The aliens allowed to fire: the lowest alien in each column
+        self.shooters = {}
+
+    def _track_alien(self, alien, column, row):
+        """Record which column and row of the fleet an alien belongs to."""
+        alien.fleet = self
+        alien.column = column
+        alien.row = row
+        self.columns[column].add(alien)
+        self.rows[row].add(alien)
+
+        if column not in self.shooters or row > self.shooters[column].row:
+            self.shooters[column] = alien
+
+    def remove_alien(self, alien):
+        """Remove a destroyed alien from its column and row, shrinking the bounding box if needed."""
+        self.columns[alien.column].discard(alien)
+        self.rows[alien.row].discard(alien)
+        self.ai_game.collision.remove_from_alien_grid(alien)
+
+        # Let the next alien up in the column fire in place of a destroyed shooter
+        if self.shooters.get(alien.column) is alien:
+            if self.columns[alien.column]:
+                self.shooters[alien.column] = max(
+                    self.columns[alien.column], key=lambda other: other.row)
+            else:
+                del self.shooters[alien.column]
+
+        # Move the outer columns and rows inward past any that are now empty
+        while self.first_column <= self.last_column and not self.columns[self.first_column]:
+            self.first_column += 1
+        while self.last_column >= self.first_column and not self.columns[self.last_column]:
+            self.last_column -= 1
+        while self.first_row <= self.last_row and not self.rows[self.first_row]:
+            self.first_row += 1
+        while self.last_row >= self.first_row and not self.rows[self.last_row]:
+            self.last_row -= 1
+
+    def get_column_extent(self, column):
+        """Return the (left, right) edges of a column of the fleet, or None if the column is empty."""
+        if not self.columns[column]:
+            return None
+        rect = next(iter(self.columns[column])).rect
+        return rect.left, rect.right
+
+    def get_row_extent(self, row):
+        """Return the (top, bottom) edges of a row of the fleet, or None if the row is empty."""
+        if not self.rows[row]:
+            return None
+        rect = next(iter(self.rows[row])).rect
+        return rect.top, rect.bottom
+
+    def get_positions(self):
+        """
+        Return the aliens' x and y positions as lists (in the same order as the aliens group).
+          They're gathered from the sprites each call; the array fleet returns its arrays instead.
+        """
+        aliens = self.aliens.sprites()
+        # The fleet drops by moving the aliens' rects, so the rects have the current heights (as in the
+        # array fleet)
+        return [alien.x for alien in aliens], [alien.rect.y for alien in aliens]
+
+    def get_bounds(self):
+        """Return a rect bounding the whole fleet, or None if every alien has been destroyed."""
+        if self.first_column > self.last_column:
+            return None
+        left = self.get_column_extent(self.first_column)[0]
+        right = self.get_column_extent(self.last_column)[1]
+        top = self.get_row_extent(self.first_row)[0]
+        bottom = self.get_row_extent(self.last_row)[1]
+        return pg.Rect(left, top, right - left, bottom - top)
+
+    def update(self):
+        """
+        Check if the fleet is at an edge, 
+          then update the positions of all aliens in the fleet.
+        """
+        dropped = self._check_fleet_edges()
+        self.aliens.update()
+        self._update_images()
+        self._fire_bullet()
+        self.prepare_next_fleet()
+
+        with self.ai_game.profiler.phase('collisions'):
+            # The aliens only need bucketing again when the fleet drops, otherwise they all moved together
+            if dropped:
+                self.ai_game.collision.build_alien_grid()
+            else:
+                self.ai_game.collision.move_alien_grid(self.settings.alien_speed * self.settings.fleet_direction)
+
+            # Look for alien-ship collisions.
+            self.ai_game.collision.check_alien_ship_collisions()
+
+            # Look for aliens hitting the bottom of the screen.
+            self.ai_game.collision.check_aliens_bottom()
+
+    def _reset_animation(self):
+        """Start a new fleet's animation on its first panel."""
+        self.animation_start = self.timeline.frame
+        self.image_index = 0
+
+    def _update_images(self):
+        """Switch every alien to the next panel when the fleet's animation timeline calls for it."""
+        elapsed = self.timeline.time_since(self.animation_start)
+        image_index = int(elapsed // ALIEN_IMG_PANEL_DURATION) % len(self.images)
+        if image_index != self.image_index:
+            self.image_index = image_index
+            image = self.images[image_index]
+            for alien in self.aliens.sprites():
+                alien.image = image
+
+    def _fire_bullet(self):
+        """Decide whether the fleet fires this frame, and if so have one of its shooters fire."""
+        if len(self.alien_bullets) >= self.settings.alien_bullets_allowed or not self.shooters:
+            return
+        if self.settings.alien_fire_rate < 1 and self.rng.random() >= self.settings.alien_fire_rate:
+            return
+
+        new_bullet = self.ai_game.projectile.alien_bullet_pool.acquire()
+        new_bullet.reset(self._choose_shooter())
+        self.alien_bullets.add(new_bullet)
+        self.sounds.play('alien_laser')
+
+    def _choose_shooter(self):
+        """Pick which shooter fires based on the fleet's targeting policy."""
+        if (self.settings.alien_fire_targeting == 'aimed' and
+                self.rng.random() < self.settings.alien_aim_rate):
+            # Fire from the shooter closest to being directly above the ship
+            return min(self.shooters.values(),
+                       key=lambda alien: abs(alien.rect.centerx - self.ship.rect.centerx))
+        return self.rng.choice(list(self.shooters.values()))
+
+    def _check_fleet_edges(self):
+        """Respond appropriately if any aliens have reached an edge, and return whether the fleet dropped."""
+        bounds = self.get_bounds()
+        if bounds and (bounds.right >= self.screen_rect.right or bounds.left <= 0):
+            self._change_fleet_direction()
+            return True
+        return False
+
+    def _change_fleet_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        for alien in self.aliens.sprites():
+            alien.rect.y += self.settings.fleet_drop_speed
+        self.settings.fleet_direction *= -1
@@ -0,0 +1,215 @@
+from pygame.sprite import Sprite
+
+from aliens import AlienFleet
+from spatial_hash import SpatialHash
+
+# NumPy is only needed for the array-backed fleet, so the game still runs without it.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _to_pixels(values):
+    """Round an array of positions the same way pygame rounds floats assigned to a Rect."""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class ArrayAlien(Sprite):
+    """An alien whose position lives in its fleet's arrays."""
+
+    def __init__(self, fleet, slot):
+        """Initialize the alien as a view onto slot in the fleet arrays."""
+        super().__init__()
+        self.fleet = fleet
+        self.slot = slot
+        self.image = fleet.images[fleet.image_index]
+        self._rect = self.image.get_rect()
+        # The fleet move the rect was last brought up to date for
+        self.synced = -1
+
+    @property
+    def rect(self):
+        """The alien's rect, only brought up to date from the fleet arrays when something reads it."""
+        fleet = self.fleet
+        if self.synced != fleet.moves:
+            self.synced = fleet.moves
+            self._rect.topleft = fleet.rects[self.slot, :2].tolist()
+        return self._rect
+
+    @property
+    def x(self):
+        """The alien's exact horizontal position."""
+        return float(self.fleet.x[self.slot])
+
+    @property
+    def y(self):
+        """The alien's vertical position."""
+        return float(self.fleet.rects[self.slot, 1])
+
+    def kill(self):
+        """Remove the alien from all groups and mark it as dead in the fleet arrays."""
+        # groupcollide calls kill() on the aliens it removes
+        if self.alive():
+            self.fleet.alive[self.slot] = False
+            self.fleet.remove_alien(self)
+        super().kill()
+
+
+class ArrayAlienGrid(SpatialHash):
+    """
+    A spatial hash of an array fleet, bucketing the live aliens' slots straight from the fleet's rects.
+      Only the aliens a query turns up have their sprites' rects brought up to date.
+    """
+
+    def __init__(self, fleet, cell_size):
+        """Initialize an empty grid for fleet."""
+        super().__init__(cell_size)
+        self.fleet = fleet
+
+    def build(self, group):
+        """Bucket every live alien in the fleet arrays (group is the fleet's aliens group)."""
+        cell_size = self.cell_size
+        self.cells = {}
+        self.offset_x = self.offset_y = self.slack = 0
+        live = np.flatnonzero(self.fleet.alive)
+        if not live.size:
+            return
+        rects = self.fleet.rects[live]
+        first = rects[:, :2] // cell_size
+        spans = (rects[:, :2] + rects[:, 2:] - 1) // cell_size - first
+
+        # Each alien once for every cell it overlaps (most aliens are smaller than a cell and fit in just one)
+        slots, cells_x, cells_y = [], [], []
+        for dx in range(int(spans[:, 0].max()) + 1):
+            for dy in range(int(spans[:, 1].max()) + 1):
+                inside = (spans[:, 0] >= dx) & (spans[:, 1] >= dy)
+                slots.append(live[inside])
+                cells_x.append(first[inside, 0] + dx)
+                cells_y.append(first[inside, 1] + dy)
+        slots, cells_x, cells_y = np.concatenate(slots), np.concatenate(cells_x), np.concatenate(cells_y)
+
+        # Sort by cell, then slot, and split into an array of slots for each cell
+        order = np.lexsort((slots, cells_y, cells_x))
+        slots, cells_x, cells_y = slots[order], cells_x[order], cells_y[order]
+        splits = np.flatnonzero((np.diff(cells_x) != 0) | (np.diff(cells_y) != 0)) + 1
+        starts = np.concatenate(([0], splits))
+        keys = zip(cells_x[starts].tolist(), cells_y[starts].tolist())
+        self.cells = dict(zip(keys, np.split(slots, splits)))
+
+    def remove(self, sprite):
+        """Nothing to do, since queries skip the aliens marked as dead in the fleet arrays."""
+
+    def query(self, rect):
+        """Return the live aliens sharing a cell with rect, in slot order (the order of the aliens group)."""
+        cells = self.cells
+        found = [cells[key] for key in self._get_cells(rect) if key in cells]
+        if not found:
+            return []
+        if len(found) > 1:
+            slots = np.unique(np.concatenate(found))
+        else:
+            slots = found[0]
+        sprites = self.fleet.sprites
+        return [sprites[slot] for slot in slots[self.fleet.alive[slots]].tolist()]
+
+
+class ArrayAlienFleet(AlienFleet):
+    """
+    An alien fleet stored as NumPy arrays (positions, alive flags, and rects),
+      so moving the fleet, checking its edges, and bucketing it for collisions are vectorized operations.
+      The alien sprites' rects are only brought up to date when they're drawn or checked for a collision.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the fleet arrays."""
+        if np is None:
+            raise ImportError("The array-backed alien fleet requires NumPy.")
+        # How many times the fleet has moved, so the alien sprites know when their rects are out of date
+        self.moves = 0
+        # Bucket the fleet for collisions from its arrays rather than the sprites' rects
+        collision = ai_game.collision
+        collision.alien_grid = ArrayAlienGrid(self, collision.alien_grid.cell_size)
+        super().__init__(ai_game)
+
+    def create_fleet(self):
+        """Create a full fleet of aliens and add it to the aliens group."""
+        layout = self._get_layout()
+        number_aliens_x, number_rows, self.spacing_x, self.spacing_y, _ = layout
+        self._reset_bounds(number_aliens_x, number_rows)
+        self._reset_animation()
+        alien_width, alien_height = self.images[0].get_size()
+        number_aliens = number_aliens_x * number_rows
+
+        # Lay the fleet out in the same grid as AlienFleet
+        columns = np.tile(np.arange(number_aliens_x), number_rows)
+        rows = np.repeat(np.arange(number_rows), number_aliens_x)
+        self.x = (alien_width * (1 + self.spacing_x * columns)).astype(np.float64)
+
+        # Each row of rects is (x, y, width, height)
+        self.rects = np.empty((number_aliens, 4), dtype=np.int64)
+        self.rects[:, 0] = _to_pixels(self.x)
+        self.rects[:, 1] = _to_pixels(
+            alien_height * (2.5 + self.spacing_y * rows))
+        self.rects[:, 2] = alien_width
+        self.rects[:, 3] = alien_height
+
+        self.alive = np.ones(number_aliens, dtype=bool)
+        self.moves += 1
+
+        # The sprites let rendering and collision checks work on the fleet as usual
+        self.sprites = self._take_next_fleet(layout)
+        for alien, column, row in zip(self.sprites, columns.tolist(), rows.tolist()):
+            self._track_alien(alien, column, row)
+        self.aliens.add(self.sprites)
+        self.ai_game.collision.build_alien_grid()
+
+    def update(self):
+        """
+        Check if the fleet is at an edge, 
+          then update the positions of all aliens in the fleet.
+        """
+        live = np.flatnonzero(self.alive)
+        dropped = False
+        if live.size:
+            dropped = self._check_fleet_edges()
+
+            # Move every live alien at once
+            self.x[live] += self.settings.alien_speed * self.settings.fleet_direction
+            self.rects[live, 0] = _to_pixels(self.x[live])
+            self.moves += 1
+
+            self._update_images()
+            self._fire_bullet()
+        self.prepare_next_fleet()
+
+        with self.ai_game.profiler.phase('collisions'):
+            # The aliens only need bucketing again when the fleet drops, otherwise they all moved together
+            if dropped:
+                self.ai_game.collision.build_alien_grid()
+            elif live.size:
+                self.ai_game.collision.move_alien_grid(self.settings.alien_speed * self.settings.fleet_direction)
+
+            # Look for alien-ship collisions.
+            self.ai_game.collision.check_alien_ship_collisions()
+
+            # Look for aliens hitting the bottom of the screen.
+            self.ai_game.collision.check_aliens_bottom()
+
+    def get_positions(self):
+        """Return the live aliens' x and y positions as arrays (in slot order, as in the aliens group)."""
+        live = np.flatnonzero(self.alive)
+        return self.x[live], self.rects[live, 1]
+
+    def _create_alien(self, slot):
+        """Create the sprite for a slot in the next fleet (its position comes from the arrays once it's in play)."""
+        alien = ArrayAlien(self, slot)
+        alien.image = self.images[0]
+        return alien
+
+    def _change_fleet_direction(self):
+        """Drop the entire fleet and change the fleet's direction."""
+        self.rects[:, 1] = _to_pixels(
+            self.rects[:, 1] + self.settings.fleet_drop_speed)
+        self.moves += 1
+        self.settings.fleet_direction *= -1
@@ -0,0 +1,107 @@
+from collections import deque
+from time import perf_counter
+
+import pygame as pg
+
+from constants import IMAGE_COLORKEY, PRELOAD_BUDGET
+from sounds import DeferredSound
+
+
+class AssetCache:
+    """A registry that loads each image and sound once and hands out shared references."""
+
+    def __init__(self):
+        """Initialize the caches and the hit/miss counters."""
+        # Images are keyed by (path, scale factor), sounds by path, rendered surfaces by (name, scale factor),
+        # and fonts by (name, size).
+        self.images = {}
+        self.sounds = {}
+        self.rendered = {}
+        self.fonts = {}
+
+        # Sounds aren't needed for the first frame, so they're loaded a few at a time in the background
+        # (or when first played, whichever comes first)
+        self.pending = deque()
+
+        # Track cache usage so we can confirm when no loading is taking place
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, scale_factor=1):
+        """Return the image at path scaled by scale_factor, loading and scaling it only the first time."""
+        key = (path, scale_factor)
+        if key in self.images:
+            self.hits += 1
+            return self.images[key]
+        self.misses += 1
+
+        image = self._prepare_image(path, scale_factor)
+        self.images[key] = image
+        return image
+
+    def _prepare_image(self, path, scale_factor):
+        """Load, scale, and colorkey an image in the display's pixel format."""
+        # Convert the image to the display's pixel format so scaling and blits don't have to
+        image = pg.image.load(path).convert()
+        if scale_factor != 1:
+            size = (int(image.get_width() * scale_factor), int(image.get_height() * scale_factor))
+            # smoothscale only works on 24 and 32 bit surfaces
+            if image.get_bitsize() in (24, 32):
+                image = pg.transform.smoothscale(image, size)
+            else:
+                image = pg.transform.scale(image, size)
+
+        # The images are drawn on the background color, which is made transparent so overlapping sprites
+        # don't cover each other with boxes. RLE keeps the transparent parts cheap to blit.
+        image.set_colorkey(IMAGE_COLORKEY, pg.RLEACCEL)
+        return image
+
+    def render(self, name, scale_factor, renderer):
+        """Return the surfaces renderer() draws for name at scale_factor, drawing them only the first time."""
+        key = (name, scale_factor)
+        if key in self.rendered:
+            self.hits += 1
+            return self.rendered[key]
+        self.misses += 1
+
+        surfaces = renderer()
+        self.rendered[key] = surfaces
+        return surfaces
+
+    def font(self, name, size):
+        """Return the font file name (None for the default system font) at size, creating it only the first time."""
+        key = (name, size)
+        if key in self.fonts:
+            self.hits += 1
+            return self.fonts[key]
+        self.misses += 1
+
+        font = pg.font.Font(name, size) if name else pg.font.SysFont(None, size)
+        self.fonts[key] = font
+        return font
+
+    def sound(self, path):
+        """Return the sound effect at path, queueing it to be loaded the first time."""
+        if path in self.sounds:
+            self.hits += 1
+            return self.sounds[path]
+        self.misses += 1
+
+        sound = DeferredSound(path)
+        self.sounds[path] = sound
+        self.pending.append(sound)
+        return sound
+
+    def load_pending(self, budget=PRELOAD_BUDGET):
+        """Load queued assets until budget milliseconds have passed (at least one is loaded if any are queued)."""
+        deadline = perf_counter() + budget / 1000
+        while self.pending:
+            self.pending.popleft().load()
+            if perf_counter() >= deadline:
+                break
+
+    def report(self):
+        """Return a summary of cache usage."""
+        return {'hits': self.hits, 'misses': self.misses, 'images': len(self.images),
+                'rendered': len(self.rendered), 'fonts': len(self.fonts), 'sounds': len(self.sounds),
+                'pending': len(self.pending)}
@@ -0,0 +1,158 @@
+import argparse
+import ast
+import itertools
+import json
+import multiprocessing
+import os
+import time
+
+# Batch games never open a window or play sound, and only print the report
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+# Leave SIGINT and SIGTERM alone so the pool can stop its worker processes
+os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+# Longest a game may run (in simulation ticks) before it's stopped, about 20 minutes of game time
+MAX_FRAMES = 36000
+
+DIFFICULTIES = ('easy', 'normal', 'hard')
+
+
+def play_demo_game(job):
+    """
+    Play one headless game with the demo ai until game over (or max_frames ticks).
+      job is (seed, difficulty name, settings overrides, max_frames). Returns the game's results.
+    """
+    seed, difficulty, overrides, max_frames = job
+    settings = Settings()
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    settings.skip_pauses = True
+
+    ai = AlienInvasion(headless=True, settings=settings, seed=seed)
+    settings.set_difficulty(getattr(settings, difficulty))
+    ai.start_game()
+
+    frames = 0
+    worst = 0
+    start = time.perf_counter()
+    while ai.stats.game_active and frames < max_frames:
+        frame_start = time.perf_counter()
+        if not ai.is_paused():
+            ai.demo.run_demo_ai()
+        ai.update_game()
+        worst = max(worst, time.perf_counter() - frame_start)
+        frames += 1
+    seconds = time.perf_counter() - start
+
+    return {
+        'seed': seed,
+        'difficulty': difficulty,
+        'overrides': overrides,
+        'level': ai.stats.level,
+        'score': int(ai.stats.score),
+        'frames': frames,
+        'finished': not ai.stats.game_active,
+        'mean_frame_ms': 1000 * seconds / frames if frames else 0,
+        'max_frame_ms': 1000 * worst,
+    }
+
+
+def run_batch(jobs, processes=None):
+    """Play every job across a pool of processes (one per core by default) and return their results."""
+    with multiprocessing.Pool(processes) as pool:
+        # Games vary a lot in length, so they're handed out a few at a time
+        chunksize = max(1, len(jobs) // (4 * (processes or os.cpu_count() or 1)))
+        return list(pool.imap(play_demo_game, jobs, chunksize))
+
+
+def summarize(results):
+    """Merge game results into one summary per configuration (difficulty and settings overrides)."""
+    configurations = {}
+    for result in results:
+        key = (result['difficulty'], json.dumps(result['overrides'], sort_keys=True))
+        configurations.setdefault(key, []).append(result)
+
+    summaries = []
+    for (difficulty, overrides), games in configurations.items():
+        levels = sorted(game['level'] for game in games)
+        summaries.append({
+            'difficulty': difficulty,
+            'overrides': json.loads(overrides),
+            'games': len(games),
+            'unfinished': sum(1 for game in games if not game['finished']),
+            'mean_level': sum(levels) / len(games),
+            'median_level': levels[(len(levels) - 1) // 2],
+            'max_level': levels[-1],
+            'mean_score': sum(game['score'] for game in games) / len(games),
+            'max_score': max(game['score'] for game in games),
+            'mean_frames': sum(game['frames'] for game in games) / len(games),
+            'mean_frame_ms': (sum(game['mean_frame_ms'] * game['frames'] for game in games) /
+                              max(sum(game['frames'] for game in games), 1)),
+            'max_frame_ms': max(game['max_frame_ms'] for game in games),
+        })
+    return summaries
+
+
+def _parse_setting(text, sweep=False):
+    """Parse NAME=VALUE (or NAME=VALUE1,VALUE2,... when sweeping) into a name and a list of values."""
+    name, separator, value = text.partition('=')
+    if not separator or not hasattr(Settings(), name):
+        raise argparse.ArgumentTypeError(f"'{text}' isn't NAME=VALUE for a setting")
+    try:
+        values = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise argparse.ArgumentTypeError(f"can't read the value in '{text}'")
+    if sweep:
+        return name, list(values) if isinstance(values, tuple) else [values]
+    return name, [values]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play many headless demo ai games in parallel and report how they went.")
+    parser.add_argument('--games', type=int, default=100, help="games to play for each configuration")
+    parser.add_argument('--difficulty', choices=DIFFICULTIES, default='normal', help="difficulty to play on")
+    parser.add_argument('--set', dest='settings', metavar='NAME=VALUE', default=[], action='append',
+                        type=_parse_setting, help="override a setting (e.g. speedup_scale=1.2)")
+    parser.add_argument('--sweep', metavar='NAME=V1,V2', default=[], action='append',
+                        type=lambda text: _parse_setting(text, sweep=True),
+                        help="play every configuration once for each value of a setting")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game (each game gets the next)")
+    parser.add_argument('--max-frames', type=int, default=MAX_FRAMES, help="ticks after which a game is stopped")
+    parser.add_argument('--processes', type=int, help="worker processes (one per core by default)")
+    parser.add_argument('--per-game', action='store_true', help="include every game's results in the report")
+    parser.add_argument('--output', metavar='FILE', help="write the report to a file instead of printing it")
+    args = parser.parse_args()
+
+    # Every configuration plays the same seeds, so configurations are compared on the same games
+    names = [name for name, _ in args.settings + args.sweep]
+    jobs = []
+    for values in itertools.product(*(values for _, values in args.settings + args.sweep)):
+        overrides = dict(zip(names, values))
+        jobs.extend((args.seed + game, args.difficulty, overrides, args.max_frames) for game in range(args.games))
+
+    start = time.perf_counter()
+    results = run_batch(jobs, args.processes)
+    report = {
+        'games': len(results),
+        'seconds': time.perf_counter() - start,
+        'configurations': summarize(results),
+    }
+    if args.per_game:
+        report['results'] = results
+
+    report = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as outf:
+            outf.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import time
+
+# Benchmarks never open a window or play sound, and only print the results
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+
+import pygame as pg
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+# Frames run before timing starts (to fill pools and caches), and frames timed in each scenario
+WARMUP_FRAMES = 30
+BENCHMARK_FRAMES = 600
+
+# The seed every scenario is run with, so each build is measured on exactly the same games
+BENCHMARK_SEED = 1
+
+# The subsystems timed each frame, as the attribute path from the game to the method being timed
+SUBSYSTEMS = {
+    'ship': ('ship', 'update'),
+    'projectiles': ('projectile', 'update'),
+    'fleet': ('fleet', 'update'),
+    'explosions': ('explosions', 'update'),
+    'demo_ai': ('demo', 'run_demo_ai'),
+    'render': ('display', 'update_screen'),
+}
+
+# How many explosions the mass explosions scenario starts each frame
+EXPLOSIONS_PER_FRAME = 20
+
+
+def _setup_level_1(settings):
+    """A full fleet at level 1 on normal difficulty."""
+    return settings.normal, None
+
+
+def _setup_hard_level_11(settings):
+    """Hard difficulty at level 11 speeds (the fastest the game gets)."""
+    def start(ai):
+        for _ in range(10):
+            ai.start_new_level()
+    return settings.hard, start
+
+
+def _setup_stress_fleet(settings):
+    """A fleet of 1000 aliens (50 columns by 20 rows) squeezed into the usual fleet area."""
+    settings.fleet_size = (50, 20)
+    return settings.normal, None
+
+
+def _setup_mass_explosions(settings):
+    """A full fleet with explosions started at the aliens' positions every frame."""
+    return settings.normal, None
+
+
+def _explode_aliens(ai):
+    """Start explosions at some of the aliens' positions (without destroying them)."""
+    for alien in ai.aliens.sprites()[:EXPLOSIONS_PER_FRAME]:
+        explosion = ai.collision.explosion_pool.acquire()
+        explosion.reset(alien)
+        ai.explosions.add(explosion)
+
+
+# Each scenario is a setup function (returning the difficulty, and anything to do once the game has
+# started), and anything to do before every frame
+SCENARIOS = {
+    'level_1': (_setup_level_1, None),
+    'hard_level_11': (_setup_hard_level_11, None),
+    'stress_1000_aliens': (_setup_stress_fleet, None),
+    'mass_explosions': (_setup_mass_explosions, _explode_aliens),
+}
+
+
+def _time_method(obj, name, samples):
+    """Replace obj's method with one that records how long each call takes (in milliseconds)."""
+    method = getattr(obj, name)
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        result = method(*args, **kwargs)
+        samples.append((time.perf_counter() - start) * 1000)
+        return result
+
+    setattr(obj, name, timed)
+
+
+def _summarize(samples):
+    """Return the mean, median, 99th percentile, and maximum of a list of frame times."""
+    if not samples:
+        return {'calls': 0}
+    ordered = sorted(samples)
+    return {
+        'calls': len(ordered),
+        'mean_ms': sum(ordered) / len(ordered),
+        'p50_ms': ordered[(len(ordered) - 1) // 2],
+        'p99_ms': ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)],
+        'max_ms': ordered[-1],
+    }
+
+
+def run_scenario(name, frames=BENCHMARK_FRAMES, array_fleet=False, dirty_rect_rendering=False):
+    """
+    Run a scenario for a fixed number of frames (one simulation tick and one render each).
+      Returns the frame time summary for each subsystem and for the whole frame, the asset cache's usage
+      (with the assets loaded during the timed frames, which should be none), and the sound effect counts.
+    """
+    setup, before_frame = SCENARIOS[name]
+    settings = Settings()
+    settings.skip_pauses = True
+    settings.array_fleet = array_fleet
+    settings.dirty_rect_rendering = dirty_rect_rendering
+    difficulty, start = setup(settings)
+
+    ai = AlienInvasion(headless=True, settings=settings, seed=BENCHMARK_SEED)
+    settings.set_difficulty(difficulty)
+    ai.start_game()
+    if start:
+        start(ai)
+
+    samples = {subsystem: [] for subsystem in SUBSYSTEMS}
+    frame_samples = []
+    for frame in range(WARMUP_FRAMES + frames):
+        # Start timing once warmed up
+        if frame == WARMUP_FRAMES:
+            warm_misses = ai.assets.misses
+            for subsystem, (attribute, method) in SUBSYSTEMS.items():
+                _time_method(getattr(ai, attribute), method, samples[subsystem])
+
+        start_time = time.perf_counter()
+        # The demo ai plays the game. The benchmark measures a game in progress, so the ship never
+        # runs out of lives.
+        ai.stats.ships_left = settings.ship_limit
+        if before_frame:
+            before_frame(ai)
+        ai.display.store_positions()
+        if not ai.is_paused():
+            ai.demo.run_demo_ai()
+        ai.update_game()
+        ai.display.update_screen(ai)
+        if frame >= WARMUP_FRAMES:
+            frame_samples.append((time.perf_counter() - start_time) * 1000)
+
+    results = {subsystem: _summarize(times) for subsystem, times in samples.items()}
+    results['frame'] = _summarize(frame_samples)
+    results['assets'] = dict(ai.assets.report(), timed_misses=ai.assets.misses - warm_misses)
+    results['sounds'] = ai.sounds.report()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the game's update and render paths under fixed scenarios.")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"the scenarios to run: {', '.join(SCENARIOS)} (all of them by default)")
+    parser.add_argument('--frames', type=int, default=BENCHMARK_FRAMES, help="frames timed in each scenario")
+    parser.add_argument('--array-fleet', action='store_true', help="use the NumPy array-backed fleet")
+    parser.add_argument('--dirty-rects', action='store_true', help="use dirty rect rendering")
+    parser.add_argument('--output', metavar='FILE', help="write the results to a file instead of printing them")
+    args = parser.parse_args()
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario '{name}'")
+
+    results = {
+        'pygame': pg.version.ver,
+        'frames': args.frames,
+        'array_fleet': args.array_fleet,
+        'dirty_rect_rendering': args.dirty_rects,
+        'scenarios': {name: run_scenario(name, args.frames, args.array_fleet, args.dirty_rects)
+                      for name in args.scenarios or SCENARIOS},
+    }
+
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as outf:
+            outf.write(report + '\n')
+    else:
+        print(report)
+
+
+if __name__ == '__main__':
+    main()
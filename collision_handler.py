@@ -1,85 +1,114 @@
-from time import sleep
-
-import pygame as pg
-from pygame import mixer
-
-from explosion import Explosion
-
-
-class CollisionHandler:
-    """A class to manage collisions."""
-
-    def __init__(self, ai_game):
-        """Initialize attributes the class needs access to"""
-        self.ai_game = ai_game
-        self.settings = ai_game.settings
-        self.screen = ai_game.display.screen
-        self.ship_bullets = ai_game.ship_bullets
-        self.alien_bullets = ai_game.alien_bullets
-        self.aliens = ai_game.aliens
-        self.explosions = ai_game.explosions
-        self.stats = ai_game.stats
-        self.sb = ai_game.sb
-        self.ship = ai_game.ship
-        self.lose_life_sound = mixer.Sound('sound_effects/lose_life.wav')
-
-    def check_bullet_alien_collisions(self):
-        """Response to bullet-alien collisions."""
-        # Remove any bullets and aliens that have collided.
-        collisions = pg.sprite.groupcollide(
-            self.ship_bullets, self.aliens, True, True)
-
-        # Increase score and generate explosions if appropriate
-        if collisions:
-            for aliens in collisions.values():
-                self.stats.score += self.settings.alien_points * len(aliens)
-                for alien in aliens:
-                    self.explosions.add(
-                        Explosion(self.ai_game, alien))
-            self.sb.prep_score()
-            # Don't increase the high score during demo gameplay
-            if not self.stats.game_demo:
-                self.sb.check_high_score()
-
-    def check_bullet_ship_collisions(self):
-        """Response to bullet-ship collisions."""
-        if pg.sprite.spritecollideany(self.ship, self.alien_bullets):
-            self._ship_hit()
-
-    def check_alien_ship_collisions(self):
-        """Check for collisions between aliens and the ship."""
-        if pg.sprite.spritecollideany(self.ship, self.aliens):
-            self._ship_hit()
-
-    def check_bullet_bullet_collisions(self):
-        """Check for collisions between ship bullets and alien bullets."""
-        # Remove any bullets that have collided.
-        collisions = pg.sprite.groupcollide(
-            self.ship_bullets, self.alien_bullets, True, True)
-
-    def check_aliens_bottom(self):
-        """Check if any aliens have reached the bottom of the screen."""
-        screen_rect = self.screen.get_rect()
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
-
-    def _ship_hit(self):
-        """Respond to the ship being hit by an alien."""
-        if self.stats.ships_left > 0:
-            # Decrement ships_left, and update scoreboard.
-            self.stats.ships_left -= 1
-            self.sb.prep_ships()
-
-            # Play sound effect for getting hit
-            self.lose_life_sound.play()
-
-            # Pause
-            sleep(2)
-
-            # Reset the current level
-            self.ai_game.reset_level()
-        else:
-            self.ai_game.game_over()
+from math import ceil
+
+from constants import COLLISION_CELL_SIZE, EXPLOSION_DURATION, FPS, RESPAWN_PAUSE, RESPAWNING
+from explosion import Explosion
+from pools import SpritePool
+from spatial_hash import SpatialHash
+
+
+class CollisionHandler:
+    """A class to manage collisions."""
+
+    def __init__(self, ai_game):
+        """Initialize attributes the class needs access to"""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.screen = ai_game.display.screen
+        self.ship_bullets = ai_game.ship_bullets
+        self.alien_bullets = ai_game.alien_bullets
+        self.aliens = ai_game.aliens
+        self.explosions = ai_game.explosions
+        self.stats = ai_game.stats
+        self.sb = ai_game.sb
+        self.ship = ai_game.ship
+        self.sounds = ai_game.sounds
+
+        # Spatial hashes so each collision check only tests sprites in nearby cells
+        cell_size = COLLISION_CELL_SIZE * ai_game.display.scale_factor
+        self.alien_grid = SpatialHash(cell_size)
+        self.alien_bullet_grid = SpatialHash(cell_size)
+
+        # A pool so explosions are reused rather than created and thrown away. Each ship bullet can
+        # destroy an alien on every frame an explosion lasts.
+        explosion_frames = ceil(EXPLOSION_DURATION * FPS / 1000) + 1
+        self.explosion_pool = SpritePool(
+            lambda: Explosion(ai_game), self.settings.ship_bullets_allowed * explosion_frames)
+
+    def build_alien_grid(self):
+        """Bucket the aliens by position (whenever the fleet is created or drops)."""
+        self.alien_grid.build(self.aliens)
+
+    def move_alien_grid(self, dx):
+        """Move the bucketed aliens along with the fleet (every alien moved dx across)."""
+        self.alien_grid.shift(dx)
+
+    def remove_from_alien_grid(self, alien):
+        """Take a destroyed alien out of the alien buckets."""
+        self.alien_grid.remove(alien)
+
+    def build_bullet_grid(self):
+        """Bucket the alien bullets by position (once per frame, after the bullets move)."""
+        self.alien_bullet_grid.build(self.alien_bullets)
+
+    def check_bullet_alien_collisions(self):
+        """Response to bullet-alien collisions."""
+        # Remove any bullets and aliens that have collided.
+        collisions = self.alien_grid.collide_group(
+            self.ship_bullets, self.aliens, True, True)
+
+        # Increase score and generate explosions if appropriate
+        if collisions:
+            for aliens in collisions.values():
+                self.stats.score += self.settings.alien_points * len(aliens)
+                for alien in aliens:
+                    explosion = self.explosion_pool.acquire()
+                    explosion.reset(alien)
+                    self.explosions.add(explosion)
+            self.sb.prep_score()
+            # Don't increase the high score during demo gameplay
+            if not self.stats.game_demo:
+                self.sb.check_high_score()
+
+    def check_bullet_ship_collisions(self):
+        """Response to bullet-ship collisions."""
+        if self.alien_bullet_grid.collide_any(self.ship, self.alien_bullets):
+            self._ship_hit()
+
+    def check_alien_ship_collisions(self):
+        """Check for collisions between aliens and the ship."""
+        if self.alien_grid.collide_any(self.ship, self.aliens):
+            self._ship_hit()
+
+    def check_bullet_bullet_collisions(self):
+        """Check for collisions between ship bullets and alien bullets."""
+        # Remove any bullets that have collided.
+        collisions = self.alien_bullet_grid.collide_group(
+            self.ship_bullets, self.alien_bullets, True, True)
+
+    def check_aliens_bottom(self):
+        """Check if any aliens have reached the bottom of the screen."""
+        # The fleet keeps track of its own bounding box, so only its bottom edge needs checking
+        screen_rect = self.screen.get_rect()
+        bounds = self.ai_game.fleet.get_bounds()
+        if bounds and bounds.bottom >= screen_rect.bottom:
+            # Treat this the same as if the ship got hit.
+            self._ship_hit()
+
+    def _ship_hit(self):
+        """Respond to the ship being hit by an alien."""
+        # The ship can only be hit once before the level resets or the game ends
+        if self.ai_game.is_paused():
+            return
+
+        if self.stats.ships_left > 0:
+            # Decrement ships_left, and update scoreboard.
+            self.stats.ships_left -= 1
+            self.sb.prep_ships()
+
+            # Play sound effect for getting hit
+            self.sounds.play('lose_life')
+
+            # Pause, then reset the current level
+            self.ai_game.pause(RESPAWNING, RESPAWN_PAUSE)
+        else:
+            self.ai_game.game_over()
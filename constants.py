@@ -1,50 +1,119 @@
-##
-# Constants used in Alien Invasion
-#
-
-import pygame
-
-# Colors
-BLACK = (0, 0, 0)
-DARK_GREEN = (0, 155, 0)
-LIGHT_GRAY = (230, 230, 230)
-LIGHT_GREEN = (0, 255, 0)
-PURPLE = (154, 0, 226)
-RED = (255, 0, 0)
-WHITE = (255, 255, 255)
-
-
-# Font related constants
-GAME_OVER_TEXT = 'Game Over!'
-GAME_TITLE = 'Alien Invasion!'
-LARGE_FONT = 100
-SMALL_FONT = 48
-START_GAME_TEXT = 'Press any Key to Start'
-TITLE_FONT = 'freesansbold.ttf'
-
-
-# Images
-ALIEN_IMG_1 = pygame.image.load('images/alien1a.bmp')
-ALIEN_IMG_2 = pygame.image.load('images/alien1b.bmp')
-SHIP_IMG = pygame.image.load('images/shipa.bmp')
-
-
-# Offsets
-# For offsetting displayed elements slightly to shift them away from other elements or the screen edge
-ELEMENT_EDGE_OFFSET = 10  # Additive
-ELEMENT_SPACING = 2  # Multiplier
-SCREEN_EDGE_OFFSET = 20  # Additive
-
-
-# Screen related constants
-SCREEN_HEIGHT = 720
-SCREEN_WIDTH = 1280
-
-
-# Time related consants (milliseconds)
-ALIEN_IMG_PANEL_DURATION = 500
-# For blinking "Press Any Key to Start" message
-BLINK_DURATION = 500
-DEMO_GAMEPLAY_TIMER = 10000
-FPS = 30
-EXPLOSION_DURATION = 125
+##
+# Constants used in Alien Invasion
+#
+
+# Colors
+BLACK = (0, 0, 0)
+DARK_GREEN = (0, 155, 0)
+LIGHT_GRAY = (230, 230, 230)
+LIGHT_GREEN = (0, 255, 0)
+PURPLE = (154, 0, 226)
+RED = (255, 0, 0)
+WHITE = (255, 255, 255)
+# Marks the transparent parts of cached UI layers (never used in the UI itself)
+UI_LAYER_COLORKEY = (255, 0, 255)
+
+
+# Font related constants
+GAME_OVER_TEXT = 'Game Over!'
+GAME_TITLE = 'Alien Invasion!'
+HIGH_SCORE_LABEL = 'High Score: '
+LARGE_FONT = 100
+LEVEL_LABEL = 'Level: '
+SCORE_LABEL = 'Score: '
+SMALL_FONT = 48
+START_GAME_TEXT = 'Press any Key to Start'
+TITLE_FONT = 'freesansbold.ttf'
+
+
+# Images (loaded through the game's AssetCache)
+ALIEN_IMG_1 = 'images/alien1a.bmp'
+ALIEN_IMG_2 = 'images/alien1b.bmp'
+SHIP_IMG = 'images/shipa.bmp'
+# The images' background color, which is drawn as transparent
+IMAGE_COLORKEY = LIGHT_GRAY
+
+
+# Sound effects (loaded through the game's AssetCache), and the channel category each one plays in
+SOUND_EFFECTS = {
+    'ship_laser': ('sound_effects/laser.wav', 'ship'),
+    'alien_laser': ('sound_effects/laser.wav', 'aliens'),
+    'explosion': ('sound_effects/explosion.wav', 'explosions'),
+    'lose_life': ('sound_effects/lose_life.wav', 'events'),
+    'game_start': ('sound_effects/game_start.wav', 'events'),
+    'game_over': ('sound_effects/game_over.wav', 'events'),
+}
+# Mixer channels each category gets (when they're all busy, the sound that started first is cut off)
+SOUND_CHANNELS = {'ship': 2, 'aliens': 3, 'explosions': 4, 'events': 2}
+# Shortest time between repeats of an effect (milliseconds), repeats any sooner are skipped
+SOUND_THROTTLE = {'alien_laser': 80, 'explosion': 50}
+
+
+# Offsets
+# For offsetting displayed elements slightly to shift them away from other elements or the screen edge
+ELEMENT_EDGE_OFFSET = 10  # Additive
+ELEMENT_SPACING = 2  # Multiplier
+SCREEN_EDGE_OFFSET = 20  # Additive
+
+
+# Profiler overlay font size, frames kept in its history, and frames between overlay refreshes
+PROFILER_FONT = 24
+PROFILER_HISTORY = 300
+PROFILER_OVERLAY_REFRESH = 15
+
+
+# Aliens of the next fleet built each simulation tick while the current level plays
+FLEET_PREBUILD_PER_TICK = 8
+
+
+# Dirty rect rendering redraws the whole screen instead when more rects than this changed (after merging),
+# or when they cover more than this fraction of the screen
+DIRTY_RECT_LIMIT = 64
+DIRTY_AREA_LIMIT = 0.3
+
+
+# Size of the cells used to bucket sprites for collision checks (scaled with the screen, about one alien wide)
+COLLISION_CELL_SIZE = 64
+
+
+# Leaderboard files (an append-only log of every run, and an index of the best runs), the number of runs
+# the index keeps, the most of the log read at startup that the index doesn't cover (bytes), and the file
+# the high score was kept in before the leaderboard
+LEADERBOARD_LOG = 'leaderboard_alien_invasion.log'
+LEADERBOARD_INDEX = 'leaderboard_alien_invasion.idx'
+LEADERBOARD_SIZE = 10
+LEADERBOARD_MAX_SCAN = 1 << 20
+LEGACY_HIGH_SCORE_FILE = 'highscore_alien_invasion.txt'
+
+
+# Screen related constants
+SCREEN_HEIGHT = 720
+SCREEN_WIDTH = 1280
+
+
+# Game states (timed pauses during which gameplay is suspended but the game keeps drawing and handling input)
+GAME_OVER = 'game over'
+RESPAWNING = 'respawning'
+STARTING = 'starting'
+
+
+# Time related consants (milliseconds)
+# Longest to spend loading assets in the background each frame
+PRELOAD_BUDGET = 4
+ALIEN_IMG_PANEL_DURATION = 500
+# For blinking "Press Any Key to Start" message
+BLINK_DURATION = 500
+DEMO_GAMEPLAY_TIMER = 10000
+# The game simulates FPS ticks per second no matter how often the screen is drawn
+FPS = 30
+# Most simulation ticks to run before drawing a frame (so a long stall doesn't snowball)
+MAX_TICKS_PER_FRAME = 5
+EXPLOSION_DURATION = 125
+# Number of panels in the explosion animation (spread evenly over its duration)
+EXPLOSION_FRAMES = 4
+# How long each pause lasts
+GAME_OVER_PAUSE = 500
+RESPAWN_PAUSE = 2000
+START_PAUSE = 500
+# Longest to wait for the leaderboard to finish writing when the game quits
+LEADERBOARD_CLOSE_TIMEOUT = 2000
@@ -1,111 +1,154 @@
-from math import sqrt
-
-import pygame as pg
-
-from constants import FPS
-
-
-class Demo():
-    """A class to manage demo gameplay."""
-
-    def __init__(self, ai_game):
-        """Initialize references to objects the class needs access to."""
-        self.ai_game = ai_game
-        self.clock = ai_game.clock
-        self.settings = ai_game.settings
-        self.display = ai_game.display
-        self.alien_bullets = ai_game.alien_bullets
-        self.aliens = ai_game.aliens
-        self.explosions = ai_game.explosions
-        self.stats = ai_game.stats
-        self.sb = ai_game.sb
-        self.ship = ai_game.ship
-        self.fleet = ai_game.fleet
-        self.projectile = ai_game.projectile
-
-    def run_demo(self):
-        """Run demo gameplay."""
-        self.stats.game_active = True
-        self.stats.game_demo = True
-        # Reset everything so each time the demo starts it's a fresh game
-        self.stats.reset_stats()
-        self.settings.initialize_dynamic_settings()
-        self.sb.prep_images()
-        self.ai_game.reset_level()
-
-        while True:
-            # Run ai script
-            self.run_demo_ai()
-
-            # Run the usual game while loop (minus checking for events)
-            self.ship.update()
-            self.projectile.update()
-            self.fleet.update()
-            self.explosions.update()
-            self.display.update_screen(self)
-
-            if not self.aliens:
-                self.ai_game.start_new_level()
-
-            # Cap fps at 30 frames per second
-            time_passed = self.clock.tick(FPS)
-
-            # End the demo gameplay in response to a keypress or mouse button
-            for event in pg.event.get():
-                if event.type == pg.KEYDOWN or event.type == pg.MOUSEBUTTONDOWN:
-                    self.stats.game_active = False
-                    self.stats.game_demo = False
-                    return
-
-            # End the demo when the ship is on its last life (before it triggers a game over)
-            if self.stats.ships_left == 0:
-                self.stats.game_active = False
-                self.stats.game_demo = False
-                return
-
-    def run_demo_ai(self):
-        """A simple ai script for the ship."""
-
-        # Don't run the demo ai if there are no aliens (e.g. while waiting for next level)
-        if not self.aliens:
-            return
-
-        #  Determine the nearest alien (if there are any aliens).
-        nearest_alien = None
-        for alien in self.aliens:
-            if nearest_alien == None:
-                nearest_alien = alien
-            elif (sqrt((alien.x - self.ship.x) ** 2 + (alien.y - self.ship.y) ** 2) <
-                    sqrt((nearest_alien.x - self.ship.x) ** 2 + (nearest_alien.y - self.ship.y) ** 2)):
-                nearest_alien = alien
-
-        # The ship will move toward the nearest alien until it's two ship-widths away
-        if nearest_alien.x - self.ship.x - 2 * self.ship.rect.width > 0:
-            self.ship.moving_right = True
-            self.ship.moving_left = False
-        elif nearest_alien.x - self.ship.x + 2 * self.ship.rect.width < 0:
-            self.ship.moving_right = False
-            self.ship.moving_left = True
-        else:
-            self.ship.moving_right = False
-            self.ship.moving_left = False
-
-        # If there are bullets close to the ship, it will priotize moving away from them
-        if self.alien_bullets:
-            for bullet in self.alien_bullets:
-                if 0 < bullet.x - self.ship.rect.centerx < 1.5 * self.ship.rect.width:
-                    self.ship.moving_left = True
-                    self.ship.moving_right = False
-                elif -1.5 * self.ship.rect.width < bullet.x - self.ship.rect.centerx <= 0:
-                    self.ship.moving_left = False
-                    self.ship.moving_right = True
-                # This last condition is to stop the ship from jittering if there's a bullet between it and the nearest alien.
-                elif (1.5 * self.ship.rect.width <= abs(bullet.x - self.ship.rect.centerx)
-                      <= 1.6 * self.ship.rect.width):
-                    self.ship.moving_left = False
-                    self.ship.moving_right = False
-
-        # Have the ship fire bullets as long as it is close to nearest alien
-        if (- 2 * self.ship.rect.width <= abs(nearest_alien.x - self.ship.rect.centerx) <=
-                2 * self.ship.rect.width):
-            self.ship.fire_bullet()
+import pygame as pg
+
+# NumPy lets the demo ai size up every alien and bullet at once, but the demo still runs without it. Only the
+# array-backed fleet hands over its positions as arrays; the default fleet gathers them into lists each tick.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class Demo():
+    """A class to manage demo gameplay."""
+
+    def __init__(self, ai_game):
+        """Initialize references to objects the class needs access to."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.display = ai_game.display
+        self.alien_bullets = ai_game.alien_bullets
+        self.aliens = ai_game.aliens
+        self.explosions = ai_game.explosions
+        self.stats = ai_game.stats
+        self.sb = ai_game.sb
+        self.ship = ai_game.ship
+        self.fleet = ai_game.fleet
+        self.projectile = ai_game.projectile
+
+    def run_demo(self):
+        """Run demo gameplay."""
+        self.stats.game_active = True
+        self.stats.game_demo = True
+        # Reset everything so each time the demo starts it's a fresh game
+        self.stats.reset_stats()
+        self.settings.initialize_dynamic_settings()
+        self.sb.prep_images()
+        self.ai_game.reset_level()
+
+        profiler = self.ai_game.profiler
+        while True:
+            profiler.begin_frame()
+
+            # Run the ai script and the usual game loop (minus checking for events) for each simulation
+            # tick that's due
+            with profiler.phase('wait'):
+                ticks = self.ai_game.timestep.tick()
+            for _ in range(ticks):
+                self.display.store_positions()
+                if not self.ai_game.is_paused():
+                    with profiler.phase('demo_ai'):
+                        self.run_demo_ai()
+                self.ai_game.update_game()
+                # Stop as soon as the ship is on its last life
+                if self.stats.ships_left == 0:
+                    break
+            with profiler.phase('render'):
+                self.display.update_screen(self, self.ai_game.timestep.get_alpha())
+
+            # End the demo gameplay in response to a keypress or mouse button
+            with profiler.phase('input'):
+                events = pg.event.get()
+            profiler.end_frame()
+            for event in events:
+                if event.type == pg.KEYDOWN or event.type == pg.MOUSEBUTTONDOWN:
+                    self._end_demo()
+                    return
+
+            # End the demo when the ship is on its last life (before it triggers a game over)
+            if self.stats.ships_left == 0:
+                self._end_demo()
+                return
+
+    def _end_demo(self):
+        """Stop demo gameplay."""
+        self.stats.game_active = False
+        self.stats.game_demo = False
+        # Don't carry a pause (e.g. from the ship being hit) over to the start screen
+        self.ai_game.cancel_pause()
+
+    def run_demo_ai(self):
+        """A simple ai script for the ship."""
+
+        # Don't run the demo ai if there are no aliens (e.g. while waiting for next level)
+        if not self.aliens:
+            return
+
+        #  Determine the nearest alien (if there are any aliens).
+        nearest_x = self._find_nearest_alien_x()
+
+        # The ship will move toward the nearest alien until it's two ship-widths away
+        if nearest_x - self.ship.x - 2 * self.ship.rect.width > 0:
+            self.ship.moving_right = True
+            self.ship.moving_left = False
+        elif nearest_x - self.ship.x + 2 * self.ship.rect.width < 0:
+            self.ship.moving_right = False
+            self.ship.moving_left = True
+        else:
+            self.ship.moving_right = False
+            self.ship.moving_left = False
+
+        # If there are bullets close to the ship, it will priotize moving away from them
+        if self.alien_bullets:
+            self._dodge_bullets()
+
+        # Have the ship fire bullets as long as it is close to nearest alien
+        if (- 2 * self.ship.rect.width <= abs(nearest_x - self.ship.rect.centerx) <=
+                2 * self.ship.rect.width):
+            self.ship.fire_bullet()
+
+    def _find_nearest_alien_x(self):
+        """Return the x position of the alien nearest the ship (the first one found if there's a tie)."""
+        # Only the order of the distances matters, so they're compared squared. The array fleet's positions
+        # are used as they are, but the default fleet's lists are copied into arrays first.
+        alien_xs, alien_ys = self.fleet.get_positions()
+        if np is not None:
+            alien_xs = np.asarray(alien_xs, dtype=np.float64)
+            dx = alien_xs - self.ship.x
+            dy = np.asarray(alien_ys, dtype=np.float64) - self.ship.y
+            return float(alien_xs[np.argmin(dx * dx + dy * dy)])
+
+        nearest = min(range(len(alien_xs)), key=lambda index: ((alien_xs[index] - self.ship.x) ** 2 +
+                                                               (alien_ys[index] - self.ship.y) ** 2))
+        return alien_xs[nearest]
+
+    def _dodge_bullets(self):
+        """Steer the ship away from the alien bullets closest to it (the last threatening bullet wins)."""
+        width = self.ship.rect.width
+        bullets = self.alien_bullets.sprites()
+        if np is not None:
+            offsets = np.fromiter((bullet.x for bullet in bullets), np.float64, len(bullets))
+            offsets -= self.ship.rect.centerx
+            distances = np.abs(offsets)
+            dodge_left = (0 < offsets) & (offsets < 1.5 * width)
+            dodge_right = (-1.5 * width < offsets) & (offsets <= 0)
+            # Stop the ship from jittering if there's a bullet between it and the nearest alien
+            hold = (1.5 * width <= distances) & (distances <= 1.6 * width)
+            threats = np.flatnonzero(dodge_left | dodge_right | hold)
+            if threats.size:
+                threat = threats[-1]
+                self.ship.moving_left = bool(dodge_left[threat])
+                self.ship.moving_right = bool(dodge_right[threat])
+            return
+
+        for bullet in bullets:
+            offset = bullet.x - self.ship.rect.centerx
+            if 0 < offset < 1.5 * width:
+                self.ship.moving_left = True
+                self.ship.moving_right = False
+            elif -1.5 * width < offset <= 0:
+                self.ship.moving_left = False
+                self.ship.moving_right = True
+            # This last condition is to stop the ship from jittering if there's a bullet between it and the nearest alien.
+            elif 1.5 * width <= abs(offset) <= 1.6 * width:
+                self.ship.moving_left = False
+                self.ship.moving_right = False
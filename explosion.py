@@ -1,47 +1,75 @@
-import pygame as pg
-from pygame import gfxdraw, mixer
-from pygame.sprite import Sprite
-
-from constants import EXPLOSION_DURATION, RED
-
-
-class Explosion(Sprite):
-    """A Class to manage explosions."""
-
-    def __init__(self, ai_game, alien):
-        """Initialize attributes and draw the explosion."""
-        super().__init__()
-        self.explosions = ai_game.explosions
-
-        # Set the surface for the explosion equal to height of the aliens
-        self.height = int(alien.rect.height)
-        self.radius = int(alien.rect.height / 2)
-        self.image = pg.Surface(
-            (self.height, self.height), pg.SRCALPHA)
-        self.rect = self.image.get_rect()
-        self.rect.center = alien.rect.center
-
-        # Track time in order to specify duration of explosion
-        self.clock = pg.time.Clock()
-        self.last_update = 0
-
-        # Draw the explosion
-        pg.gfxdraw.aacircle(self.image, self.radius,
-                            self.radius, self.radius, RED)
-        pg.gfxdraw.filled_circle(
-            self.image, self.radius, self.radius, self.radius, RED)
-
-        # Load and play explosion sound
-        self.explosion_sound = mixer.Sound('sound_effects/explosion.wav')
-        self.explosion_sound.play()
-
-    def update(self):
-        """Update the explosion."""
-        # Remove the explosion after a set amount of time
-        self.last_update += self.clock.tick()
-        if self.last_update > EXPLOSION_DURATION:
-            self.explosions.remove(self)
-
-    def blitme(self):
-        """Draw the explosion."""
-        self.surface.blit(self.image, self.rect)
+import pygame as pg
+from pygame import gfxdraw
+
+from constants import ALIEN_IMG_1, EXPLOSION_DURATION, EXPLOSION_FRAMES, RED
+from pools import PooledSprite
+
+
+def render_explosion_frames(height):
+    """Draw each panel of the explosion animation: a red circle that grows and fades."""
+    frames = []
+    center = int(height / 2)
+    for index in range(EXPLOSION_FRAMES):
+        progress = index / max(EXPLOSION_FRAMES - 1, 1)
+        radius = max(int(center * (0.6 + 0.4 * progress)), 1)
+        color = RED + (int(255 * (1 - 0.5 * progress)),)
+
+        frame = pg.Surface((height, height), pg.SRCALPHA)
+        pg.gfxdraw.aacircle(frame, center, center, radius, color)
+        pg.gfxdraw.filled_circle(frame, center, center, radius, color)
+        frames.append(frame)
+    return frames
+
+
+class Explosion(PooledSprite):
+    """A Class to manage explosions."""
+
+    def __init__(self, ai_game, alien=None):
+        """Initialize attributes (and start the explosion at the alien's position if one is given)."""
+        super().__init__()
+        self.explosions = ai_game.explosions
+        self.timeline = ai_game.timeline
+
+        # The explosion panels are the height of the aliens, and are drawn once and shared by every explosion
+        scale_factor = ai_game.display.scale_factor
+        height = ai_game.assets.image(ALIEN_IMG_1, scale_factor).get_height()
+        self.frames = ai_game.assets.render(
+            'explosion', scale_factor, lambda: render_explosion_frames(height))
+        self.frame_index = 0
+        self.image = self.frames[self.frame_index]
+        self.rect = self.image.get_rect()
+
+        # Explosion sounds are played through the game's sound manager
+        self.sounds = ai_game.sounds
+
+        if alien:
+            self.reset(alien)
+
+    def reset(self, alien):
+        """Start the explosion over at the alien's position (used when the explosion is reused)."""
+        self.rect.center = alien.rect.center
+
+        # Track when the explosion started in order to specify its duration and current panel
+        self.start_frame = self.timeline.frame
+        self.frame_index = 0
+        self.image = self.frames[self.frame_index]
+
+        # Play explosion sound
+        self.sounds.play('explosion')
+
+    def update(self):
+        """Update the explosion."""
+        # Remove the explosion after a set amount of time
+        elapsed = self.timeline.time_since(self.start_frame)
+        if elapsed > EXPLOSION_DURATION:
+            self.explosions.remove(self)
+            return
+
+        # Show the panel for the current point in the explosion
+        self.frame_index = min(int(elapsed * EXPLOSION_FRAMES / EXPLOSION_DURATION),
+                               EXPLOSION_FRAMES - 1)
+        self.image = self.frames[self.frame_index]
+
+    def blitme(self):
+        """Draw the explosion."""
+        self.surface.blit(self.image, self.rect)
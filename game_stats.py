@@ -1,27 +1,25 @@
-class GameStats:
-    """Track statistics for Alien Invasion."""
-
-    def __init__(self, ai_game):
-        """Initialize statistics."""
-        self.settings = ai_game.settings
-        self.reset_stats()
-
-        # Start game in an inactive state.
-        self.game_active = False
-        self.game_demo = False
-        self.game_over = False
-
-        # High score should never be reset.
-        try:
-            inf = open("highscore_alien_invasion.txt")
-            parts = inf.readline().split()
-            self.high_score = int(parts[0])
-            inf.close()
-        except:
-            self.high_score = 0
-
-    def reset_stats(self):
-        """Initialize statistics that can change during the game."""
-        self.ships_left = self.settings.ship_limit
-        self.score = 0
-        self.level = 1
+class GameStats:
+    """Track statistics for Alien Invasion."""
+
+    def __init__(self, ai_game):
+        """Initialize statistics."""
+        self.settings = ai_game.settings
+        self.reset_stats()
+
+        # Start game in an inactive state.
+        self.game_active = False
+        self.game_demo = False
+        self.game_over = False
+
+        # The pause the game is in (None while playing), and how many simulation ticks it has left
+        self.pause_state = None
+        self.pause_ticks = 0
+
+        # High score should never be reset.
+        self.high_score = ai_game.leaderboard.get_high_score()
+
+    def reset_stats(self):
+        """Initialize statistics that can change during the game."""
+        self.ships_left = self.settings.ship_limit
+        self.score = 0
+        self.level = 1
@@ -0,0 +1,48 @@
+import pygame as pg
+
+# The characters numbers are written with
+NUMBER_CHARACTERS = '0123456789,-'
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered labels and characters for one font, composed into text with a few blits
+      (so changing text such as the score never has to be rendered by the font again).
+    """
+
+    def __init__(self, font, text_color, bg_color, labels=(), characters=NUMBER_CHARACTERS):
+        """Render every label and character once."""
+        self.font = font
+        self.text_color = text_color
+        self.bg_color = bg_color
+        self.glyphs = {}
+        for piece in tuple(labels) + tuple(characters):
+            self._get_glyph(piece)
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+        self.uniform_height = all(glyph.get_height() == self.height for glyph in self.glyphs.values())
+
+    def _get_glyph(self, piece):
+        """Return the image of a label or character, rendering it if it hasn't been seen before."""
+        glyph = self.glyphs.get(piece)
+        if glyph is None:
+            # Converted to the display's pixel format so composing text is plain copies
+            glyph = self.font.render(piece, True, self.text_color, self.bg_color).convert()
+            self.glyphs[piece] = glyph
+        return glyph
+
+    def render(self, label, text):
+        """Return an image of label followed by text, composed from the pre-rendered glyphs."""
+        glyphs = [self._get_glyph(label)] + [self._get_glyph(character) for character in text]
+        image = pg.Surface((sum(glyph.get_width() for glyph in glyphs), self.height))
+        # Glyphs are rendered on the background color, so they only need a background behind them
+        # if they're shorter than the text
+        if not self.uniform_height:
+            image.fill(self.bg_color)
+
+        positions = []
+        x = 0
+        for glyph in glyphs:
+            positions.append((glyph, (x, 0)))
+            x += glyph.get_width()
+        image.blits(positions, doreturn=False)
+        return image
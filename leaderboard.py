@@ -0,0 +1,177 @@
+import json
+import os
+import queue
+import threading
+import time
+
+from constants import (LEADERBOARD_CLOSE_TIMEOUT, LEADERBOARD_INDEX, LEADERBOARD_LOG, LEADERBOARD_MAX_SCAN,
+                       LEADERBOARD_SIZE, LEGACY_HIGH_SCORE_FILE)
+
+INDEX_VERSION = 1
+
+
+class Leaderboard:
+    """
+    Every finished run, kept in an append-only log with an index of the best runs.
+      Runs are written by a background thread so the game never waits on the disk.
+    """
+
+    def __init__(self, ai_game):
+        """Load the best runs from the index (and any of the log it doesn't cover yet)."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        # Headless games (benchmarks, batch runs, replays) don't touch the leaderboard files
+        self.enabled = not ai_game.headless
+
+        # The best runs, highest score first. Each run is a dict of its score, level, difficulty,
+        # timestamp, and replay file (if it was recorded).
+        self.runs = []
+        if not self.enabled:
+            return
+
+        # Runs waiting for the writer thread, each with a copy of the best runs once it was added
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self._write_runs, name='leaderboard', daemon=True)
+        self.writer.start()
+
+        self._load()
+
+    def get_high_score(self):
+        """Return the best score on the leaderboard (0 if there aren't any runs yet)."""
+        return self.runs[0]['score'] if self.runs else 0
+
+    def add_run(self):
+        """Add the run that just ended to the leaderboard, and queue it to be written."""
+        if not self.enabled:
+            return
+        stats = self.ai_game.stats
+        recorder = self.ai_game.recorder
+        run = {
+            'score': int(stats.score),
+            'level': stats.level,
+            'difficulty': self.settings.difficulty_names.get(self.settings.difficulty),
+            'timestamp': int(time.time()),
+            'replay': os.path.basename(recorder.path) if recorder else None,
+        }
+        self._add_to_index(run)
+        self.queue.put((run, list(self.runs)))
+
+    def close(self):
+        """Wait (briefly) for the writer thread to write any queued runs, then stop it."""
+        if not self.enabled:
+            return
+        self.queue.put(None)
+        self.writer.join(LEADERBOARD_CLOSE_TIMEOUT / 1000)
+
+    def _add_to_index(self, run):
+        """Add a run to the best runs if it's good enough."""
+        self.runs.append(run)
+        self.runs.sort(key=lambda best: best['score'], reverse=True)
+        del self.runs[LEADERBOARD_SIZE:]
+
+    def _load(self):
+        """
+        Read the index, then the runs logged after it was last written (at most LEADERBOARD_MAX_SCAN bytes,
+          so starting the game takes about the same time however long the log gets).
+        """
+        try:
+            with open(LEADERBOARD_INDEX) as inf:
+                index = json.load(inf)
+            if index['version'] != INDEX_VERSION:
+                raise ValueError
+            offset = index['offset']
+            self.runs = index['runs']
+        except (OSError, ValueError, KeyError, TypeError):
+            offset = 0
+            self.runs = []
+
+        try:
+            log_size = os.path.getsize(LEADERBOARD_LOG)
+        except OSError:
+            log_size = 0
+        # The index is for a different log (e.g. the log was deleted), so start over from the log itself
+        if offset > log_size:
+            offset = 0
+            self.runs = []
+
+        if offset < log_size:
+            for run in self._read_log(max(offset, log_size - LEADERBOARD_MAX_SCAN)):
+                self._add_to_index(run)
+            # Save the caught up index so the next start doesn't have to read those runs again
+            self.queue.put((None, list(self.runs)))
+        elif not log_size:
+            self._import_legacy_high_score()
+
+    def _read_log(self, offset):
+        """Return the runs in the log from offset on, skipping anything unreadable (e.g. a partly written run)."""
+        runs = []
+        with open(LEADERBOARD_LOG, 'rb') as inf:
+            inf.seek(offset)
+            # Starting partway into a run, so skip to the next one
+            if offset and not self._starts_line(inf, offset):
+                inf.readline()
+            for line in inf:
+                try:
+                    run = json.loads(line)
+                    run['score'] = int(run['score'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+                runs.append(run)
+        return runs
+
+    def _starts_line(self, inf, offset):
+        """Return whether offset in the log is the start of a line."""
+        inf.seek(offset - 1)
+        starts_line = inf.read(1) == b'\n'
+        inf.seek(offset)
+        return starts_line
+
+    def _import_legacy_high_score(self):
+        """Add the high score from the old single score file as a run, so it isn't lost."""
+        try:
+            with open(LEGACY_HIGH_SCORE_FILE) as inf:
+                score = int(inf.readline().split()[0])
+        except (OSError, ValueError, IndexError):
+            return
+        run = {'score': score, 'level': None, 'difficulty': None, 'timestamp': None, 'replay': None}
+        self._add_to_index(run)
+        self.queue.put((run, list(self.runs)))
+
+    def _write_runs(self):
+        """Append queued runs to the log and rewrite the index after each (runs in the writer thread)."""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            run, runs = item
+            try:
+                offset = self._append_run(run) if run else os.path.getsize(LEADERBOARD_LOG)
+                self._write_index(offset, runs)
+            except OSError:
+                print("Error recording run.")
+
+    def _append_run(self, run):
+        """Append a run to the log, making sure it's on disk, and return the log's new size."""
+        with open(LEADERBOARD_LOG, 'ab') as outf:
+            # A run cut off partway through (e.g. by a crash) is left as its own unreadable line
+            if outf.tell() and not self._ends_line():
+                outf.write(b'\n')
+            outf.write(json.dumps(run).encode() + b'\n')
+            outf.flush()
+            os.fsync(outf.fileno())
+            return outf.tell()
+
+    def _ends_line(self):
+        """Return whether the log ends with a complete line."""
+        with open(LEADERBOARD_LOG, 'rb') as inf:
+            inf.seek(-1, os.SEEK_END)
+            return inf.read(1) == b'\n'
+
+    def _write_index(self, offset, runs):
+        """Replace the index in one step, so it's never left half written."""
+        temp_path = LEADERBOARD_INDEX + '.tmp'
+        with open(temp_path, 'w') as outf:
+            json.dump({'version': INDEX_VERSION, 'offset': offset, 'runs': runs}, outf)
+            outf.flush()
+            os.fsync(outf.fileno())
+        os.replace(temp_path, LEADERBOARD_INDEX)
@@ -0,0 +1,67 @@
+from pygame.sprite import Sprite
+
+
+class PooledSprite(Sprite):
+    """A sprite that returns itself to its pool once it has been removed from every group."""
+
+    def __init__(self):
+        """Initialize the sprite (the pool that creates it sets the pool attributes)."""
+        super().__init__()
+        self.pool = None
+        self.in_pool = False
+        # Number of times the sprite has been handed out by its pool
+        self.uses = 0
+
+    def kill(self):
+        """Remove the sprite from all groups and return it to its pool."""
+        super().kill()
+        self._release()
+
+    def remove_internal(self, group):
+        """Remove the sprite from a group, returning it to its pool if that was its last group."""
+        # Group.remove() and Group.empty() call this rather than kill()
+        super().remove_internal(group)
+        self._release()
+
+    def _release(self):
+        """Return the sprite to its pool if it's no longer in any groups."""
+        if self.pool and not self.alive():
+            self.pool.release(self)
+
+
+class SpritePool:
+    """A pool of sprites that are reused rather than created each time one is needed."""
+
+    def __init__(self, factory, capacity=0):
+        """Initialize the pool and create capacity sprites up front using factory."""
+        self.factory = factory
+        self.free = []
+        # Number of sprites the pool has ever created
+        self.allocated = 0
+        self.reserve(capacity)
+
+    def reserve(self, capacity):
+        """Create sprites until the pool holds at least capacity of them."""
+        while self.allocated < capacity:
+            self.free.append(self._create())
+
+    def acquire(self):
+        """Return a free sprite (only creating one if every sprite in the pool is in use)."""
+        sprite = self.free.pop() if self.free else self._create()
+        sprite.in_pool = False
+        sprite.uses += 1
+        return sprite
+
+    def release(self, sprite):
+        """Return a sprite to the pool so it can be reused."""
+        if not sprite.in_pool:
+            sprite.in_pool = True
+            self.free.append(sprite)
+
+    def _create(self):
+        """Create a new sprite belonging to the pool."""
+        sprite = self.factory()
+        sprite.pool = self
+        sprite.in_pool = True
+        self.allocated += 1
+        return sprite
@@ -0,0 +1,196 @@
+import json
+from collections import deque
+from time import perf_counter
+
+import pygame as pg
+
+from constants import (BLACK, ELEMENT_EDGE_OFFSET, FPS, PROFILER_FONT, PROFILER_HISTORY,
+                       PROFILER_OVERLAY_REFRESH, SHIP_IMG)
+
+# The phases shown in the overlay (collisions are timed within the projectile and fleet updates)
+PHASES = ('input', 'wait', 'demo_ai', 'ship', 'projectiles', 'fleet', 'collisions', 'explosions', 'render')
+
+
+class _NullPhase:
+    """Stands in for a phase while the profiler is off, so timing a phase costs next to nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Times one phase of a frame each time it's entered."""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, perf_counter())
+        return False
+
+
+class Profiler:
+    """Times each phase of every frame, keeps a rolling history, and draws it as an overlay."""
+
+    def __init__(self, ai_game):
+        """Initialize the profiler (off unless profiling is turned on in the settings)."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.sf = ai_game.display.scale_factor
+        self.enabled = self.settings.profiling
+
+        # The most recent frames. Each is (start, duration, time per phase, entity counts, phase events).
+        self.history = deque(maxlen=PROFILER_HISTORY)
+        self.frame_start = None
+        self.phase_times = {}
+        self.phase_events = []
+        self._phases = {}
+
+        # Trace timestamps are measured from when the profiler was created
+        self.epoch = perf_counter()
+        # Where to write a trace of the recorded frames when the game quits (if anywhere)
+        self.trace_path = None
+
+        # The overlay is only redrawn every so often so it's readable (and cheap)
+        self.font = ai_game.assets.font(None, int(self.sf * PROFILER_FONT))
+        self.overlay_image = None
+        self.overlay_rect = None
+        self.frames_since_refresh = 0
+
+    def toggle(self):
+        """Turn the profiler (and its overlay) on or off."""
+        self.enabled = not self.enabled
+        self.frame_start = None
+        self.overlay_image = None
+
+    def phase(self, name):
+        """Return a context manager that times a phase of the current frame (if a frame is being timed)."""
+        # Phases run outside of a frame (e.g. a game driven through step()) aren't recorded anywhere
+        if not self.enabled or self.frame_start is None:
+            return _NULL_PHASE
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def begin_frame(self):
+        """Start timing a frame."""
+        if not self.enabled:
+            return
+        self.frame_start = perf_counter()
+        self.phase_times = {}
+        self.phase_events = []
+
+    def record(self, name, start, end):
+        """Add a timed phase to the current frame."""
+        self.phase_times[name] = self.phase_times.get(name, 0) + end - start
+        self.phase_events.append((name, start, end - start))
+
+    def end_frame(self):
+        """Finish timing a frame, add it to the history, and refresh the overlay if it's due."""
+        if not self.enabled or self.frame_start is None:
+            return
+        duration = perf_counter() - self.frame_start
+        self.history.append((self.frame_start, duration, self.phase_times, self._count_entities(),
+                             self.phase_events))
+        # Close the frame so nothing more is added to it once it's in the history
+        self.frame_start = None
+
+        self.frames_since_refresh += 1
+        if self.overlay_image is None or self.frames_since_refresh >= PROFILER_OVERLAY_REFRESH:
+            self._prep_overlay()
+            self.frames_since_refresh = 0
+
+    def _count_entities(self):
+        """Return the number of each kind of sprite in play."""
+        return {'aliens': len(self.ai_game.aliens),
+                'ship_bullets': len(self.ai_game.ship_bullets),
+                'alien_bullets': len(self.ai_game.alien_bullets),
+                'explosions': len(self.ai_game.explosions)}
+
+    def get_summary(self):
+        """Return the fps, average and worst frame times, average time per phase, and latest entity counts."""
+        frames = len(self.history)
+        if not frames:
+            return None
+        first_start = self.history[0][0]
+        last_start, last_duration, _, counts, _ = self.history[-1]
+        elapsed = last_start + last_duration - first_start
+        durations = [frame[1] for frame in self.history]
+
+        phase_totals = {}
+        for frame in self.history:
+            for name, seconds in frame[2].items():
+                phase_totals[name] = phase_totals.get(name, 0) + seconds
+
+        budget = 1 / FPS
+        return {
+            'fps': frames / elapsed if elapsed else 0,
+            'frame_ms': 1000 * sum(durations) / frames,
+            'worst_ms': 1000 * max(durations),
+            'over_budget': sum(1 for duration in durations if duration > budget),
+            'phase_ms': {name: 1000 * total / frames for name, total in phase_totals.items()},
+            'counts': counts,
+        }
+
+    def _prep_overlay(self):
+        """Turn the latest summary into a rendered image, placed below the scoreboard's ships."""
+        summary = self.get_summary()
+        lines = [f"FPS: {summary['fps']:.1f}",
+                 f"Frame: {summary['frame_ms']:.2f} ms (worst {summary['worst_ms']:.2f})",
+                 f"Over {1000 / FPS:.0f} ms: {summary['over_budget']} of {len(self.history)}"]
+        for name in PHASES:
+            if name in summary['phase_ms']:
+                lines.append(f"  {name}: {summary['phase_ms'][name]:.2f} ms")
+        for name, count in summary['counts'].items():
+            lines.append(f"{name.replace('_', ' ').capitalize()}: {count}")
+        sounds = self.ai_game.sounds.report()
+        lines.append(f"Sounds: {sounds['played']} played, {sounds['throttled']} throttled, "
+                     f"{sounds['interrupted']} cut off")
+
+        images = [self.font.render(line, True, BLACK, self.settings.bg_color) for line in lines]
+        self.overlay_image = pg.Surface((max(image.get_width() for image in images),
+                                         sum(image.get_height() for image in images)))
+        self.overlay_image.fill(self.settings.bg_color)
+        y = 0
+        for image in images:
+            self.overlay_image.blit(image, (0, y))
+            y += image.get_height()
+
+        ship_height = self.ai_game.assets.image(SHIP_IMG, self.sf).get_height()
+        self.overlay_rect = self.overlay_image.get_rect()
+        self.overlay_rect.left = ELEMENT_EDGE_OFFSET
+        self.overlay_rect.top = 2 * ELEMENT_EDGE_OFFSET + ship_height
+
+    def export_trace(self, path):
+        """Write the recorded frames to a Chrome trace event file (open it in chrome://tracing or Perfetto)."""
+        events = []
+        for start, duration, _, counts, phase_events in self.history:
+            events.append(self._trace_event('frame', start, duration))
+            events.extend(self._trace_event(name, phase_start, phase_duration)
+                          for name, phase_start, phase_duration in phase_events)
+            events.append({'name': 'entities', 'ph': 'C', 'ts': self._microseconds(start),
+                           'pid': 0, 'tid': 0, 'args': counts})
+
+        with open(path, 'w') as outf:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, outf)
+
+    def _trace_event(self, name, start, duration):
+        """Return a complete trace event for a timed phase."""
+        return {'name': name, 'ph': 'X', 'ts': self._microseconds(start),
+                'dur': duration * 1e6, 'pid': 0, 'tid': 0}
+
+    def _microseconds(self, moment):
+        """Return a perf_counter moment as microseconds since the profiler was created."""
+        return (moment - self.epoch) * 1e6
@@ -0,0 +1,141 @@
+import struct
+import time
+
+import pygame as pg
+
+# File layout: a header, then a stream of tagged records. Event records hold the input handled before
+# each simulation tick, checksum records hold the score, level, and ships left at regular intervals,
+# and an end record holds the total number of ticks.
+MAGIC = b'AIRP'
+VERSION = 1
+HEADER = struct.Struct('<4sHQHHB')  # magic, version, seed, screen width, screen height, flags
+EVENT = struct.Struct('<IBIhh')  # tick, event type, key, mouse x, mouse y
+CHECKSUM = struct.Struct('<IqHB')  # tick, score, level, ships left
+END = struct.Struct('<I')  # total ticks
+
+EVENT_TAG = b'E'
+CHECKSUM_TAG = b'C'
+END_TAG = b'Z'
+
+# Header flags
+SKIP_PAUSES = 1
+
+# How often (in simulation ticks) to record a checksum
+CHECKSUM_INTERVAL = 30
+
+# The events that affect gameplay, and the codes used to store them
+EVENT_CODES = {pg.KEYDOWN: 1, pg.KEYUP: 2, pg.MOUSEBUTTONDOWN: 3}
+EVENT_TYPES = {code: event_type for event_type, code in EVENT_CODES.items()}
+
+
+class Recorder:
+    """Writes the input handled before each simulation tick, and periodic checksums, to a replay file."""
+
+    def __init__(self, ai_game, path):
+        """Open the replay file and write the header."""
+        self.ai_game = ai_game
+        self.stats = ai_game.stats
+        self.path = path
+        self.outf = open(path, 'wb')
+
+        flags = SKIP_PAUSES if ai_game.settings.skip_pauses else 0
+        screen_rect = ai_game.display.screen.get_rect()
+        self.outf.write(HEADER.pack(MAGIC, VERSION, ai_game.seed,
+                                    screen_rect.width, screen_rect.height, flags))
+
+    def record_event(self, event):
+        """Record an event about to be handled (events that don't affect gameplay are skipped)."""
+        code = EVENT_CODES.get(event.type)
+        if code is None:
+            return
+        key = getattr(event, 'key', 0)
+        # Positions are recorded on the game's screen, which may be drawn at a different size than the window
+        x, y = self.ai_game.display.to_screen_pos(getattr(event, 'pos', (0, 0)))
+        self.outf.write(EVENT_TAG + EVENT.pack(self.ai_game.tick_count, code, key, x, y))
+
+    def record_tick(self):
+        """Record a checksum if one is due after the tick that just ran."""
+        if self.ai_game.tick_count % CHECKSUM_INTERVAL == 0:
+            self._write_checksum()
+
+    def close(self):
+        """Write a final checksum and the end record, and close the file."""
+        self._write_checksum()
+        self.outf.write(END_TAG + END.pack(self.ai_game.tick_count))
+        self.outf.close()
+
+    def _write_checksum(self):
+        """Write the current score, level, and ships left."""
+        self.outf.write(CHECKSUM_TAG + CHECKSUM.pack(self.ai_game.tick_count, int(self.stats.score),
+                                                     self.stats.level, self.stats.ships_left))
+
+
+class Replay:
+    """A recorded session loaded from a replay file."""
+
+    def __init__(self, path):
+        """Read the replay file."""
+        with open(path, 'rb') as inf:
+            data = inf.read()
+
+        magic, version, self.seed, width, height, flags = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay file.")
+        self.size = (width, height)
+        self.skip_pauses = bool(flags & SKIP_PAUSES)
+
+        # Events are grouped by the tick they were handled before
+        self.events = {}
+        self.checksums = []
+        self.total_ticks = None
+        offset = HEADER.size
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            offset += 1
+            if tag == EVENT_TAG:
+                tick, code, key, x, y = EVENT.unpack_from(data, offset)
+                offset += EVENT.size
+                event_type = EVENT_TYPES[code]
+                if event_type == pg.MOUSEBUTTONDOWN:
+                    event = pg.event.Event(event_type, pos=(x, y), button=1)
+                else:
+                    event = pg.event.Event(event_type, key=key)
+                self.events.setdefault(tick, []).append(event)
+            elif tag == CHECKSUM_TAG:
+                self.checksums.append(CHECKSUM.unpack_from(data, offset))
+                offset += CHECKSUM.size
+            elif tag == END_TAG:
+                self.total_ticks, = END.unpack_from(data, offset)
+                offset += END.size
+            else:
+                raise ValueError(f"{path} is corrupt (unknown record at byte {offset - 1}).")
+
+        # A session that didn't shut down cleanly ends at its last checksum
+        if self.total_ticks is None:
+            self.total_ticks = self.checksums[-1][0] if self.checksums else 0
+
+    def run(self, ai_game_class, settings):
+        """
+        Play the session back in a headless game as fast as possible.
+          Returns a report of the ticks run, time taken, and any checksums that didn't match.
+        """
+        settings.headless_size = self.size
+        settings.skip_pauses = self.skip_pauses
+        ai = ai_game_class(headless=True, settings=settings, seed=self.seed)
+
+        checksums = {checksum[0]: checksum[1:] for checksum in self.checksums}
+        mismatches = []
+        start = time.perf_counter()
+        for tick in range(self.total_ticks):
+            ai.step(self.events.get(tick, ()))
+            expected = checksums.get(ai.tick_count)
+            if expected is not None:
+                actual = (int(ai.stats.score), ai.stats.level, ai.stats.ships_left)
+                if actual != expected:
+                    mismatches.append({'tick': ai.tick_count, 'expected': expected, 'actual': actual})
+        seconds = time.perf_counter() - start
+
+        return {'ticks': self.total_ticks, 'seconds': seconds,
+                'ticks_per_second': self.total_ticks / seconds if seconds else None,
+                'checksums': len(checksums), 'mismatches': mismatches,
+                'score': int(ai.stats.score), 'level': ai.stats.level, 'ships_left': ai.stats.ships_left}
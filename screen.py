@@ -1,202 +1,477 @@
-import ctypes
-from itertools import cycle
-
-import pygame as pg
-from pygame import transform
-
-from constants import *
-
-
-class Display:
-    """Manages the display for Alien Invasion."""
-
-    def __init__(self, ai_game):
-        """Initialize the screen."""
-        self.ai_game = ai_game
-        self.settings = ai_game.settings
-
-        # Enable DPI detection
-        ctypes.windll.user32.SetProcessDPIAware()
-
-        # Get information about the users screen size
-        infoObject = pg.display.Info()
-        self.width = infoObject.current_w
-        self.height = infoObject.current_h
-
-        # Calculate factor for scaling images based on native resolution and screen size
-        self.scale_factor = self.width / self.settings.screen_width
-
-        # Change screen size dependent settings
-        self.settings.scale_settings(self.scale_factor)
-
-        # Initialize screen
-        self.surface = pg.Surface((self.width, self.height))
-        self.screen = pg.display.set_mode(
-            (0, 0), pg.FULLSCREEN)
-        self.settings.screen_width = self.screen.get_rect().width
-        self.settings.screen_height = self.screen.get_rect().height
-        pg.display.set_caption("Alien Invasion")
-
-    def initialize_object_attributes(self, ai_game):
-        """Initilize attributes associated with objects created after the Display object itself."""
-        self.ship_bullets = ai_game.ship_bullets
-        self.alien_bullets = ai_game.alien_bullets
-        self.aliens = ai_game.aliens
-        self.explosions = ai_game.explosions
-        self.stats = ai_game.stats
-        self.sb = ai_game.sb
-        self.ship = ai_game.ship
-
-    def create_buttons(self):
-        """Create the various buttons to be displayed"""
-        # The buttons are created in the center of the screen then offset in the x/y directions by a number of button
-        # widths. E.g. The "-1, 0" for the easy button means to shift the button one button width left of center.
-        self.easy_button = Button(self.ai_game, "Easy", -1, 0)
-        self.normal_button = Button(self.ai_game, "Normal", 0, 0)
-        self.hard_button = Button(self.ai_game, "Hard", 1, 0)
-        self.quit_button = Button(self.ai_game, "Quit", 0, 1)
-        self.buttons = (self.easy_button, self.normal_button,
-                        self.hard_button, self.quit_button)
-
-    def create_start_screen(self):
-        """Create the game start screen."""
-        titleFont = pg.font.Font(
-            TITLE_FONT, int(self.scale_factor * LARGE_FONT))
-        font = pg.font.SysFont(None, int(self.scale_factor * SMALL_FONT))
-
-        # Create and position the title text
-        self.title_text = titleFont.render(
-            GAME_TITLE, True, DARK_GREEN, self.settings.bg_color)
-        self.title_text_rect = self.title_text.get_rect()
-        self.title_text_rect.center = self.screen.get_rect().center
-        self.title_text_rect.centery -= self.title_text_rect.height
-
-        # Create and position blinking "press any key" text
-        # Render the text to display
-        self.on_text = font.render(
-            START_GAME_TEXT, True, BLACK, self.settings.bg_color)
-        # Position the rect object for the blinking text
-        self.blink_rect = self.on_text.get_rect()
-        self.blink_rect.center = self.screen.get_rect().center
-        self.blink_rect.centery += ELEMENT_SPACING * self.title_text_rect.height
-        # Set the off_text surface and fill it in with the background color
-        self.off_text = pg.Surface(self.blink_rect.size)
-        self.off_text.fill(self.settings.bg_color)
-        # Create an iterator that repreatedly iterates over the two elements "on_text" and "off_text"
-        self.blink_surfaces = cycle([self.on_text, self.off_text])
-        # Create a variable to store the next value from the iterator
-        self.blink_surface = next(self.blink_surfaces)
-        # Define a new event (events are represented by integers, with pygame.USEREVENT have the highest value pygame uses)
-        self.BLINKEVENT = pg.USEREVENT + 1
-        # Set a timer to trigger a BLINKEVENT
-        pg.time.set_timer(self.BLINKEVENT, BLINK_DURATION)
-
-        # Hide the mouse cursor
-        pg.mouse.set_visible(False)
-
-    def display_start_screen(self, demo):
-        """Display the game start screen."""
-
-        # Set a timer for displaying demo gameplay
-        DEMOEVENT = pg.USEREVENT + 2
-        pg.time.set_timer(DEMOEVENT, DEMO_GAMEPLAY_TIMER)
-
-        # Set the while loop for the start screen
-        while True:
-            self.surface.fill(self.settings.bg_color)
-            self.surface.blit(self.title_text, self.title_text_rect)
-
-            for event in pg.event.get():
-                # Reset the game state in response to user input in case of demo gameplay
-                if event.type == pg.KEYDOWN or event.type == pg.MOUSEBUTTONDOWN:
-                    self.ai_game.reset_level()
-                    self.stats.reset_stats()
-                    self.sb.prep_images()
-                    return
-                # Blink the start game text at every BLINKEVENT
-                if event.type == self.BLINKEVENT:
-                    self.blink_surface = next(self.blink_surfaces)
-                # Run demo gameplay in response to a DEMOEVENT
-                if event.type == DEMOEVENT:
-                    demo.run_demo()
-
-            self.surface.blit(self.blink_surface, self.blink_rect)
-            self.screen.blit(self.surface, (0, 0))
-            pg.display.flip()
-
-    def create_game_over_msg(self):
-        """Create the message to display at game over."""
-        font = pg.font.SysFont(None, int(self.scale_factor * LARGE_FONT))
-
-        # Create and position the game over text
-        # Render the text to display
-        self.game_over_text = font.render(
-            GAME_OVER_TEXT, True, BLACK)
-        self.game_over_text_rect = self.game_over_text.get_rect()
-        self.game_over_text_rect.center = self.screen.get_rect().center
-        self.game_over_text_rect.centery -= ELEMENT_SPACING * \
-            self.game_over_text_rect.height
-
-    def update_screen(self, ai_game):
-        """Update images on the screen, and flip to the new screen."""
-        self.surface.fill(self.settings.bg_color)
-        self.ship.blitme()
-        for bullet in self.ship_bullets.sprites():
-            bullet.draw_bullet()
-        for bullet in self.alien_bullets.sprites():
-            bullet.draw_bullet()
-        self.aliens.draw(self.surface)
-        self.explosions.draw(self.surface)
-
-        # Draw the score information.
-        self.sb.show_score()
-
-        # Draw the difficulty buttons if the game is inactive.
-        if not self.stats.game_active:
-            for button in self.buttons:
-                button.draw_button()
-
-        # Draw the game over message if appropriate
-        if self.stats.game_over:
-            self.surface.blit(self.game_over_text, self.game_over_text_rect)
-
-        # Make the most recently drawn screen visible.
-        self.screen.blit(self.surface, (0, 0))
-        pg.display.flip()
-
-
-class Button:
-
-    def __init__(self, ai_game, msg, x1, y1):
-        """Initialize button attributes."""
-        self.sf = ai_game.display.scale_factor
-        self.screen = ai_game.display.screen
-        self.surface = ai_game.display.surface
-
-        # Set the dimensions and properties of the button.
-        self.width, self.height = 200 * self.sf, 50 * self.sf
-        self.button_color = LIGHT_GREEN
-        self.text_color = WHITE
-        self.font = pg.font.SysFont(None, int(self.sf * SMALL_FONT))
-
-        # Build the botton's rect object and center it.
-        self.rect = pg.Rect(0, 0, self.width, self.height)
-        self.rect.center = self.screen.get_rect().center
-        # Move the button to its proper location
-        self.rect.x += x1 * self.width
-        self.rect.y += y1 * self.height
-
-        # Prep the button message
-        self._prep_msg(msg)
-
-    def _prep_msg(self, msg):
-        """Turn msg into a rendered image and center text on the button."""
-        self.msg_image = self.font.render(
-            msg, True, self.text_color, self.button_color)
-        self.msg_image_rect = self.msg_image.get_rect()
-        self.msg_image_rect.center = self.rect.center
-
-    def draw_button(self):
-        """Draw blank button and then draw message"""
-        self.surface.fill(self.button_color, self.rect)
-        self.surface.blit(self.msg_image, self.msg_image_rect)
+import ctypes
+import sys
+from itertools import cycle
+from time import perf_counter
+
+import pygame as pg
+from pygame import transform
+
+from constants import *
+from ui_layer import UILayer
+
+
+class Display:
+    """Manages the display for Alien Invasion."""
+
+    def __init__(self, ai_game):
+        """Initialize the screen."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+
+        if ai_game.headless:
+            # Headless games simulate at the base resolution (unless told otherwise) since nothing is ever shown
+            self.width, self.height = (self.settings.headless_size or
+                                       (self.settings.screen_width, self.settings.screen_height))
+        else:
+            # Enable DPI detection (only available on Windows)
+            if sys.platform == 'win32':
+                ctypes.windll.user32.SetProcessDPIAware()
+
+            # Get information about the users screen size
+            infoObject = pg.display.Info()
+            self.width = infoObject.current_w
+            self.height = infoObject.current_h
+
+            # Drawing at a fixed render resolution keeps fill and blit costs the same on any monitor
+            if self.settings.render_resolution:
+                self.width, self.height = self.settings.render_resolution
+
+        # Calculate factor for scaling images based on native resolution and screen size
+        self.scale_factor = self.width / self.settings.screen_width
+
+        # Change screen size dependent settings
+        self.settings.scale_settings(self.scale_factor)
+
+        # Initialize screen
+        if ai_game.headless:
+            self.window = pg.display.set_mode((self.width, self.height))
+        else:
+            self.window = pg.display.set_mode(
+                (0, 0), pg.FULLSCREEN)
+        self.surface = pg.Surface((self.width, self.height))
+        if self.window.get_size() == (self.width, self.height):
+            self.screen = self.window
+            self.present_surface = None
+        else:
+            # The game is drawn at the render resolution, so that's the screen as far as the game knows.
+            # Each frame is scaled up into a preallocated part of the window that keeps the aspect ratio.
+            self.screen = self.surface
+            self.present_surface = self.window.subsurface(self._get_present_rect())
+            self.window.fill(BLACK)
+        self.settings.screen_width = self.screen.get_rect().width
+        self.settings.screen_height = self.screen.get_rect().height
+        pg.display.set_caption("Alien Invasion")
+
+        # How long after the game was launched the first frame was shown (in milliseconds)
+        self.time_to_first_frame = None
+
+        # What was drawn last frame, for dirty rect rendering (the first frame is always a full redraw).
+        # Sprites map to where they were drawn and with what image, UI elements are keyed by name.
+        self.full_redraw = True
+        self.previous_sprites = {}
+        self.previous_ui_elements = {}
+
+        # Where moving objects were before the latest simulation tick, and how far the frame being drawn
+        # is between that tick and the next one (for interpolated drawing)
+        self.previous_positions = {}
+        self.alpha = 1
+
+    def initialize_object_attributes(self, ai_game):
+        """Initilize attributes associated with objects created after the Display object itself."""
+        self.ship_bullets = ai_game.ship_bullets
+        self.alien_bullets = ai_game.alien_bullets
+        self.aliens = ai_game.aliens
+        self.explosions = ai_game.explosions
+        self.stats = ai_game.stats
+        self.sb = ai_game.sb
+        self.ship = ai_game.ship
+        self.profiler = ai_game.profiler
+
+    def create_buttons(self):
+        """Create the various buttons to be displayed"""
+        # The buttons are created in the center of the screen then offset in the x/y directions by a number of button
+        # widths. E.g. The "-1, 0" for the easy button means to shift the button one button width left of center.
+        self.easy_button = Button(self.ai_game, "Easy", -1, 0)
+        self.normal_button = Button(self.ai_game, "Normal", 0, 0)
+        self.hard_button = Button(self.ai_game, "Hard", 1, 0)
+        self.quit_button = Button(self.ai_game, "Quit", 0, 1)
+        self.buttons = (self.easy_button, self.normal_button,
+                        self.hard_button, self.quit_button)
+
+    def create_start_screen(self):
+        """Create the game start screen."""
+        titleFont = self.ai_game.assets.font(TITLE_FONT, int(self.scale_factor * LARGE_FONT))
+        font = self.ai_game.assets.font(None, int(self.scale_factor * SMALL_FONT))
+
+        # Create and position the title text
+        self.title_text = titleFont.render(
+            GAME_TITLE, True, DARK_GREEN, self.settings.bg_color)
+        self.title_text_rect = self.title_text.get_rect()
+        self.title_text_rect.center = self.screen.get_rect().center
+        self.title_text_rect.centery -= self.title_text_rect.height
+
+        # Create and position blinking "press any key" text
+        # Render the text to display
+        self.on_text = font.render(
+            START_GAME_TEXT, True, BLACK, self.settings.bg_color)
+        # Position the rect object for the blinking text
+        self.blink_rect = self.on_text.get_rect()
+        self.blink_rect.center = self.screen.get_rect().center
+        self.blink_rect.centery += ELEMENT_SPACING * self.title_text_rect.height
+        # The start screen with the blinking text on and off is rendered once as two layers
+        on_layer, off_layer = self.ai_game.assets.render(
+            'start_screen', self.scale_factor,
+            lambda: (UILayer([(self.title_text, self.title_text_rect), (self.on_text, self.blink_rect)]),
+                     UILayer([(self.title_text, self.title_text_rect)])))
+        # Create an iterator that repreatedly iterates over the two layers
+        self.blink_layers = cycle([on_layer, off_layer])
+        # Create a variable to store the next value from the iterator
+        self.blink_layer = next(self.blink_layers)
+        # Define a new event (events are represented by integers, with pygame.USEREVENT have the highest value pygame uses)
+        self.BLINKEVENT = pg.USEREVENT + 1
+        # Set a timer to trigger a BLINKEVENT
+        pg.time.set_timer(self.BLINKEVENT, BLINK_DURATION)
+
+        # Hide the mouse cursor
+        pg.mouse.set_visible(False)
+
+    def display_start_screen(self, demo):
+        """Display the game start screen."""
+
+        # Set a timer for displaying demo gameplay
+        DEMOEVENT = pg.USEREVENT + 2
+        pg.time.set_timer(DEMOEVENT, DEMO_GAMEPLAY_TIMER)
+
+        # Set the while loop for the start screen. The screen only changes when the text blinks (or after
+        # demo gameplay), so it's only redrawn then.
+        redraw = True
+        while True:
+            if redraw:
+                self.surface.fill(self.settings.bg_color)
+                self.blink_layer.draw(self.surface)
+                self._present()
+                redraw = False
+            # Load the assets that weren't needed for the start screen while it's showing
+            self.ai_game.assets.load_pending()
+            self.ai_game.clock.tick(self.settings.render_fps)
+
+            for event in pg.event.get():
+                # Reset the game state in response to user input in case of demo gameplay
+                if event.type == pg.KEYDOWN or event.type == pg.MOUSEBUTTONDOWN:
+                    self.ai_game.reset_level()
+                    self.stats.reset_stats()
+                    self.sb.prep_images()
+                    self.request_full_redraw()
+                    return
+                # Blink the start game text at every BLINKEVENT
+                if event.type == self.BLINKEVENT:
+                    self.blink_layer = next(self.blink_layers)
+                    redraw = True
+                # Run demo gameplay in response to a DEMOEVENT
+                if event.type == DEMOEVENT:
+                    demo.run_demo()
+                    redraw = True
+
+    def create_game_over_msg(self):
+        """Create the message to display at game over."""
+        font = self.ai_game.assets.font(None, int(self.scale_factor * LARGE_FONT))
+
+        # Create and position the game over text
+        # Render the text to display (on the background color, like the rest of the UI text)
+        self.game_over_text = font.render(
+            GAME_OVER_TEXT, True, BLACK, self.settings.bg_color)
+        self.game_over_text_rect = self.game_over_text.get_rect()
+        self.game_over_text_rect.center = self.screen.get_rect().center
+        self.game_over_text_rect.centery -= ELEMENT_SPACING * \
+            self.game_over_text_rect.height
+
+    def _get_ui_layer(self):
+        """Return the cached layer of static UI (buttons and game over text) for the game's state, if any."""
+        show_buttons = not self.stats.game_active
+        show_game_over = self.stats.game_over
+        if not (show_buttons or show_game_over):
+            return None
+
+        elements = []
+        if show_buttons:
+            elements.extend((button.image, button.rect) for button in self.buttons)
+        if show_game_over:
+            elements.append((self.game_over_text, self.game_over_text_rect))
+        name = 'ui' + ('_buttons' if show_buttons else '') + ('_game_over' if show_game_over else '')
+        return self.ai_game.assets.render(name, self.scale_factor, lambda: UILayer(elements))
+
+    def request_full_redraw(self):
+        """Redraw the whole screen next frame (e.g. after a level resets)."""
+        self.full_redraw = True
+        # Don't draw anything partway between its old and new positions across a reset
+        self.previous_positions = {}
+
+    def store_positions(self):
+        """Remember where everything that moves is before a simulation tick, for interpolated drawing."""
+        if not self.settings.interpolate_rendering:
+            return
+        # Pooled sprites record how many times they've been used, so a reused sprite isn't drawn
+        # partway between its old life and its new one
+        positions = {self.ship: (self.ship.rect.topleft, 0)}
+        for group in (self.ship_bullets, self.alien_bullets, self.aliens):
+            for sprite in group.sprites():
+                positions[sprite] = (sprite.rect.topleft, getattr(sprite, 'uses', 0))
+        self.previous_positions = positions
+
+    def _get_draw_rect(self, sprite):
+        """Return where to draw a sprite, interpolating between its previous and current positions."""
+        previous = self.previous_positions.get(sprite)
+        if previous is None or previous[1] != getattr(sprite, 'uses', 0):
+            return sprite.rect
+        (previous_x, previous_y), rect = previous[0], sprite.rect
+        return rect.move(round((previous_x - rect.x) * (1 - self.alpha)),
+                         round((previous_y - rect.y) * (1 - self.alpha)))
+
+    def update_screen(self, ai_game, alpha=1):
+        """
+        Update images on the screen, and flip to the new screen.
+          alpha is how far the frame is between the last simulation tick and the next one.
+        """
+        self.alpha = alpha
+        # Frames drawn at a render resolution are scaled up whole, so dirty rects wouldn't save anything
+        if not self.settings.dirty_rect_rendering or self.present_surface is not None:
+            self._redraw()
+            return
+
+        sprites = self._get_sprites()
+        ui_elements = self._get_ui_elements()
+        dirty_rects = None if self.full_redraw else self._get_dirty_rects(sprites, ui_elements)
+        if dirty_rects is None:
+            self._redraw(sprites)
+        else:
+            # Erase the parts of the screen that changed, then redraw (and present) only what's in them
+            for rect in dirty_rects:
+                self.surface.fill(self.settings.bg_color, rect)
+            self._draw_elements(sprites, dirty_rects, ui_elements)
+            self._present(dirty_rects)
+
+        # Remember what was drawn so the next frame only has to redraw what changed
+        self.previous_sprites = sprites
+        self.previous_ui_elements = ui_elements
+
+    def _redraw(self, sprites=None):
+        """Draw the whole screen and make it visible."""
+        self.surface.fill(self.settings.bg_color)
+        self._draw_elements(sprites)
+        self._present()
+        self.full_redraw = False
+
+    def _present(self, rects=None):
+        """
+        Copy what was drawn to the screen and make it visible (just rects, if given), and report how long
+          the first frame took.
+        """
+        if self.present_surface is not None:
+            # Drawn at the render resolution, so the whole frame is scaled up to the window in one go
+            transform.scale(self.surface, self.present_surface.get_size(), self.present_surface)
+            pg.display.flip()
+        elif rects is None:
+            self.screen.blit(self.surface, (0, 0))
+            pg.display.flip()
+        else:
+            for rect in rects:
+                self.screen.blit(self.surface, rect, rect)
+            pg.display.update(rects)
+
+        if self.time_to_first_frame is None:
+            self.time_to_first_frame = 1000 * (perf_counter() - self.ai_game.launch_time)
+            if not self.ai_game.headless:
+                print(f"Time to first frame: {self.time_to_first_frame:.0f} ms")
+
+    def _get_present_rect(self):
+        """Return the largest part of the window with the render resolution's aspect ratio, centered."""
+        window_width, window_height = self.window.get_size()
+        scale = min(window_width / self.width, window_height / self.height)
+        rect = pg.Rect(0, 0, round(self.width * scale), round(self.height * scale))
+        rect.center = (window_width // 2, window_height // 2)
+        return rect.clip(self.window.get_rect())
+
+    def to_screen_pos(self, pos):
+        """Return where a position in the window (e.g. of the mouse) is on the game's screen."""
+        if self.present_surface is None:
+            return pos
+        x, y = self.present_surface.get_abs_offset()
+        width, height = self.present_surface.get_size()
+        return (int((pos[0] - x) * self.width / width), int((pos[1] - y) * self.height / height))
+
+    def _get_dirty_rects(self, sprites, ui_elements):
+        """
+        Return the merged rects covering everything that changed since the last frame,
+          or None if so much changed that redrawing the whole screen is cheaper.
+        """
+        rects = []
+        area = 0
+        area_limit = DIRTY_AREA_LIMIT * self.width * self.height
+        previous_sprites = self.previous_sprites
+        for sprite, (rect, image) in sprites.items():
+            previous = previous_sprites.get(sprite)
+            if previous is None:
+                rects.append(rect)
+            elif previous[0] != rect or previous[1] is not image:
+                # A sprite that only moved a little is covered by one rect spanning both positions
+                if previous[0].colliderect(rect):
+                    rects.append(previous[0].union(rect))
+                else:
+                    rects.extend((previous[0], rect))
+            else:
+                continue
+            # Stop as soon as it's clear the whole screen will be redrawn
+            area += rects[-1].width * rects[-1].height
+            if area > area_limit:
+                return None
+        rects.extend(previous[0] for sprite, previous in previous_sprites.items() if sprite not in sprites)
+
+        # UI elements only need redrawing when they've changed or moved
+        for key in self.previous_ui_elements.keys() | ui_elements.keys():
+            previous = self.previous_ui_elements.get(key)
+            current = ui_elements.get(key)
+            if (previous and current and previous[0] is current[0]
+                    and previous[1] == current[1]):
+                continue
+            if previous:
+                rects.append(previous[1])
+            if current:
+                rects.append(current[1])
+
+        if sum(rect.width * rect.height for rect in rects) > area_limit:
+            return None
+        rects = self._merge_rects(rects)
+        if len(rects) > DIRTY_RECT_LIMIT:
+            return None
+        return rects
+
+    def _merge_rects(self, rects):
+        """
+        Return rects with the ones that overlap, touch, or share a row merged together.
+          Filling and copying cost more per row than per pixel, so one rect across a whole row of aliens
+          is cheaper than a rect for each alien.
+        """
+        merged = []
+        for rect in sorted(rects, key=lambda rect: (rect.top, rect.left)):
+            if merged:
+                last = merged[-1]
+                overlap = min(last.bottom, rect.bottom) - max(last.top, rect.top)
+                if 2 * overlap >= min(last.height, rect.height) or last.inflate(2, 2).colliderect(rect):
+                    last.union_ip(rect)
+                    continue
+            merged.append(pg.Rect(rect))
+        return merged
+
+    def _get_sprites(self):
+        """Return where each moving object is drawn (a copy of its rect), and with what image."""
+        sprites = {self.ship: (self._get_draw_rect(self.ship).copy(), self.ship.image)}
+        for group in (self.ship_bullets, self.alien_bullets, self.aliens, self.explosions):
+            for sprite in group.sprites():
+                sprites[sprite] = (self._get_draw_rect(sprite).copy(), getattr(sprite, 'image', None))
+        return sprites
+
+    def _get_ui_elements(self):
+        """Return the image and a copy of the rect of every UI element currently shown, by name."""
+        elements = {
+            'score': (self.sb.score_image, self.sb.score_rect.copy()),
+            'high_score': (self.sb.high_score_image, self.sb.high_score_rect.copy()),
+            'level': (self.sb.level_image, self.sb.level_rect.copy()),
+        }
+        for number, ship in enumerate(self.sb.ships.sprites()):
+            elements[('ship', number)] = (ship.image, ship.rect.copy())
+        ui_layer = self._get_ui_layer()
+        if ui_layer:
+            elements['ui_layer'] = (ui_layer.image, ui_layer.rect.copy())
+        if self.profiler.enabled and self.profiler.overlay_image:
+            elements['profiler'] = (self.profiler.overlay_image, self.profiler.overlay_rect.copy())
+        return elements
+
+    def _draw_elements(self, sprites=None, dirty_rects=None, ui_elements=None):
+        """
+        Draw the ship, projectiles, aliens, explosions, and UI to the drawing surface.
+          sprites are where to draw each moving object, if they've already been worked out (see _get_sprites).
+          If dirty_rects are given, only what overlaps them is drawn (with the UI from ui_elements).
+        """
+        def get_rect(sprite):
+            return sprites[sprite][0] if sprites else self._get_draw_rect(sprite)
+
+        def is_dirty(rect):
+            return dirty_rects is None or rect.collidelist(dirty_rects) != -1
+
+        ship_rect = get_rect(self.ship)
+        if is_dirty(ship_rect):
+            self.ship.blitme(ship_rect)
+        for bullets in (self.ship_bullets, self.alien_bullets):
+            for bullet in bullets.sprites():
+                rect = get_rect(bullet)
+                if is_dirty(rect):
+                    bullet.draw_bullet(rect)
+        if self.previous_positions or sprites:
+            for alien in self.aliens.sprites():
+                rect = get_rect(alien)
+                if is_dirty(rect):
+                    self.surface.blit(alien.image, rect)
+        else:
+            self.aliens.draw(self.surface)
+        if dirty_rects is None:
+            self.explosions.draw(self.surface)
+        else:
+            for explosion in self.explosions.sprites():
+                if is_dirty(explosion.rect):
+                    self.surface.blit(explosion.image, explosion.rect)
+
+        if dirty_rects is not None:
+            # The UI elements are drawn in the same order as below
+            for image, rect in ui_elements.values():
+                if is_dirty(rect):
+                    self.surface.blit(image, rect)
+            return
+
+        # Draw the score information.
+        self.sb.show_score()
+
+        # Draw the difficulty buttons if the game is inactive, and the game over message if appropriate
+        ui_layer = self._get_ui_layer()
+        if ui_layer:
+            ui_layer.draw(self.surface)
+
+        # Draw the profiler overlay if it's on
+        if self.profiler.enabled and self.profiler.overlay_image:
+            self.surface.blit(self.profiler.overlay_image, self.profiler.overlay_rect)
+
+
+class Button:
+
+    def __init__(self, ai_game, msg, x1, y1):
+        """Initialize button attributes."""
+        self.sf = ai_game.display.scale_factor
+        self.screen = ai_game.display.screen
+
+        # Set the dimensions and properties of the button.
+        self.width, self.height = 200 * self.sf, 50 * self.sf
+        self.button_color = LIGHT_GREEN
+        self.text_color = WHITE
+        self.font = ai_game.assets.font(None, int(self.sf * SMALL_FONT))
+
+        # Build the botton's rect object and center it.
+        self.rect = pg.Rect(0, 0, self.width, self.height)
+        self.rect.center = self.screen.get_rect().center
+        # Move the button to its proper location
+        self.rect.x += x1 * self.width
+        self.rect.y += y1 * self.height
+
+        # Prep the button message
+        self.msg = msg
+        self._prep_msg(msg)
+
+    def _prep_msg(self, msg):
+        """Turn msg into a rendered image and center text on the button."""
+        self.msg_image = self.font.render(
+            msg, True, self.text_color, self.button_color)
+        self.msg_image_rect = self.msg_image.get_rect()
+        self.msg_image_rect.center = self.rect.center
+
+        # Render the whole button (background and message) once
+        self.image = pg.Surface(self.rect.size).convert()
+        self.image.fill(self.button_color)
+        self.image.blit(self.msg_image, self.msg_image_rect.move(-self.rect.x, -self.rect.y))
@@ -1,69 +1,104 @@
-from constants import LIGHT_GRAY, PURPLE, RED, SCREEN_HEIGHT, SCREEN_WIDTH
-
-
-class Settings:
-    """A class to store all settings for Alien Invasion."""
-
-    def __init__(self):
-        """Initialize the game's static settings."""
-        # Screen settings
-        self.screen_width = SCREEN_WIDTH
-        self.screen_height = SCREEN_HEIGHT
-        self.bg_color = LIGHT_GRAY
-
-        # Ship settings
-        self.ship_limit = 3
-
-        # Bullet settings
-        self.bullet_width = 3
-        self.bullet_height = 15
-        self.ship_bullet_color = PURPLE
-        self.alien_bullet_color = RED
-        self.ship_bullets_allowed = 3
-
-        # Alien settings
-        self.fleet_drop_speed = 10
-
-        # Difficulty settings (initial speeds multiplied by speedup_scale ** diff)
-        self.easy = 1
-        self.normal = 2
-        self.hard = 3
-
-        # How quickly the game speeds up
-        self.speedup_scale = 1.1
-
-        # How quickly the alien point values increase
-        self.score_scale = 1.5
-
-        self.initialize_dynamic_settings()
-
-    def initialize_dynamic_settings(self):
-        """Initialize settings that change throughout the game."""
-        self.ship_speed = 9.0
-        self.bullet_speed = 11.0
-        self.alien_speed = 6.0
-        self.alien_bullets_allowed = 1
-
-        # fleet_direction of 1 represents right; -1 represents left.
-        self.fleet_direction = 1
-
-        # Scoring
-        self.alien_points = 50
-
-    def scale_settings(self, scale_factor):
-        """ Scale the bullet size and rate of fleet movement down the screen based on screen size."""
-        self.bullet_width *= scale_factor
-        self.bullet_height *= scale_factor
-        self.fleet_drop_speed *= scale_factor
-
-    def increase_speed(self):
-        """Increase speed settings and alien point values."""
-        self.ship_speed *= self.speedup_scale
-        self.bullet_speed *= self.speedup_scale
-        self.alien_speed *= self.speedup_scale
-
-        self.alien_points = int(self.alien_points * self.score_scale)
-
-    def set_difficulty(self, difficulty):
-        """Set the games difficulty."""
-        self.alien_bullets_allowed *= difficulty
+from constants import LIGHT_GRAY, PURPLE, RED, SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+class Settings:
+    """A class to store all settings for Alien Invasion."""
+
+    def __init__(self):
+        """Initialize the game's static settings."""
+        # Screen settings
+        self.screen_width = SCREEN_WIDTH
+        self.screen_height = SCREEN_HEIGHT
+        self.bg_color = LIGHT_GRAY
+        # Draw at this fixed (width, height) with unscaled images, then scale each frame up to the screen
+        # (None to draw at the screen's own resolution)
+        self.render_resolution = None
+        # Only redraw and present the parts of the screen that changed each frame
+        self.dirty_rect_rendering = False
+        # How many frames per second to draw (0 for uncapped), and whether to draw moving objects
+        # between their positions from the last two simulation ticks
+        self.render_fps = 60
+        self.interpolate_rendering = True
+        # End pauses (game start, respawning, game over) immediately, e.g. for fast headless runs
+        self.skip_pauses = False
+        # Screen size to simulate in headless runs (None for the base screen size)
+        self.headless_size = None
+        # Time each phase of every frame and show the results in an overlay (toggled with F3)
+        self.profiling = False
+
+        # Ship settings
+        self.ship_limit = 3
+
+        # Bullet settings
+        self.bullet_width = 3
+        self.bullet_height = 15
+        self.ship_bullet_color = PURPLE
+        self.alien_bullet_color = RED
+        self.ship_bullets_allowed = 3
+
+        # Alien settings
+        self.fleet_drop_speed = 10
+        # Store the fleet in NumPy arrays (faster for very large fleets, requires NumPy)
+        self.array_fleet = False
+        # Number of (columns, rows) in the fleet, e.g. for stress tests (None for as many as fit on the screen)
+        self.fleet_size = None
+
+        # Difficulty settings (initial speeds multiplied by speedup_scale ** diff)
+        self.easy = 1
+        self.normal = 2
+        self.hard = 3
+        # The difficulty of the current game, and each difficulty's name (for the leaderboard)
+        self.difficulty = self.normal
+        self.difficulty_names = {self.easy: 'easy', self.normal: 'normal', self.hard: 'hard'}
+
+        # How quickly the game speeds up
+        self.speedup_scale = 1.1
+
+        # How quickly the alien point values increase
+        self.score_scale = 1.5
+
+        # How the fleet fires for each difficulty: the chance it fires on a frame when below its bullet
+        # limit, and how it picks the shooter ('random' or 'aimed' at the ship)
+        self.alien_fire_rates = {self.easy: 0.5, self.normal: 1.0, self.hard: 1.0}
+        self.alien_targeting = {self.easy: 'random', self.normal: 'random', self.hard: 'aimed'}
+        # The chance an aimed shot is fired from the shooter closest to the ship (otherwise a random shooter
+        # fires), so aimed fire can still be dodged
+        self.alien_aim_rate = 0.25
+
+        self.initialize_dynamic_settings()
+
+    def initialize_dynamic_settings(self):
+        """Initialize settings that change throughout the game."""
+        self.ship_speed = 9.0
+        self.bullet_speed = 11.0
+        self.alien_speed = 6.0
+        self.alien_bullets_allowed = 1
+        self.alien_fire_rate = 1.0
+        self.alien_fire_targeting = 'random'
+
+        # fleet_direction of 1 represents right; -1 represents left.
+        self.fleet_direction = 1
+
+        # Scoring
+        self.alien_points = 50
+
+    def scale_settings(self, scale_factor):
+        """ Scale the bullet size and rate of fleet movement down the screen based on screen size."""
+        self.bullet_width *= scale_factor
+        self.bullet_height *= scale_factor
+        self.fleet_drop_speed *= scale_factor
+
+    def increase_speed(self):
+        """Increase speed settings and alien point values."""
+        self.ship_speed *= self.speedup_scale
+        self.bullet_speed *= self.speedup_scale
+        self.alien_speed *= self.speedup_scale
+
+        self.alien_points = int(self.alien_points * self.score_scale)
+
+    def set_difficulty(self, difficulty):
+        """Set the games difficulty."""
+        self.difficulty = difficulty
+        self.alien_bullets_allowed *= difficulty
+        self.alien_fire_rate = self.alien_fire_rates[difficulty]
+        self.alien_fire_targeting = self.alien_targeting[difficulty]
@@ -0,0 +1,104 @@
+from collections import deque
+
+from pygame import mixer
+
+from constants import SOUND_CHANNELS, SOUND_EFFECTS, SOUND_THROTTLE
+
+
+class NullSound:
+    """A silent stand-in for mixer.Sound used when the mixer isn't initialized (e.g. headless runs)."""
+
+    def play(self, *args, **kwargs):
+        """Do nothing."""
+        return None
+
+
+class DeferredSound:
+    """A sound effect that's only loaded when it's first played (unless it's preloaded before then)."""
+
+    def __init__(self, path):
+        """Remember where the sound is without loading it."""
+        self.path = path
+        self.sound = None
+
+    def load(self):
+        """Load the sound if it hasn't been loaded yet, and return it."""
+        if self.sound is None:
+            self.sound = load_sound(self.path)
+        return self.sound
+
+    def play(self, *args, **kwargs):
+        """Play the sound, loading it first if need be."""
+        return self.load().play(*args, **kwargs)
+
+
+def load_sound(path):
+    """Load a sound effect, or return a silent stand-in if the mixer isn't running."""
+    if mixer.get_init() is None:
+        return NullSound()
+    return mixer.Sound(path)
+
+
+class SoundManager:
+    """Plays every sound effect through a fixed budget of mixer channels per category, skipping rapid repeats."""
+
+    def __init__(self, ai_game):
+        """Set up the channels and the shared sound for each effect."""
+        # Without a running mixer (e.g. headless runs and benchmarks) nothing is ever loaded or heard, but
+        # requests to play sounds are still throttled and counted
+        self.enabled = mixer.get_init() is not None
+        self.timeline = ai_game.timeline
+        self.sounds = {}
+        self.channels = {}
+        # The timeline frame each throttled sound was last played on
+        self.last_played = {}
+
+        # Count what happened to each request to play a sound
+        self.played = 0
+        self.throttled = 0
+        self.interrupted = 0
+
+        if not self.enabled:
+            return
+
+        # Every channel belongs to a category, so one kind of sound can't crowd out the others
+        total = sum(SOUND_CHANNELS.values())
+        mixer.set_num_channels(total)
+        mixer.set_reserved(total)
+        first = 0
+        for category, count in SOUND_CHANNELS.items():
+            self.channels[category] = deque(mixer.Channel(first + index) for index in range(count))
+            first += count
+
+        # Effects that use the same file share one sound
+        for name, (path, _) in SOUND_EFFECTS.items():
+            self.sounds[name] = ai_game.assets.sound(path)
+
+    def play(self, name):
+        """Play a sound effect on one of its category's channels (unless it was played too recently)."""
+        # Repeats are measured in game time, so the same game throttles the same sounds however fast it runs
+        interval = SOUND_THROTTLE.get(name)
+        if interval is not None:
+            last = self.last_played.get(name)
+            if last is not None and self.timeline.time_since(last) < interval:
+                self.throttled += 1
+                return
+            self.last_played[name] = self.timeline.frame
+        self.played += 1
+        if not self.enabled:
+            return
+
+        # Channels are kept in the order they were last used, so if none are free the first one has been
+        # playing the longest and is cut off
+        channels = self.channels[SOUND_EFFECTS[name][1]]
+        channel = next((channel for channel in channels if not channel.get_busy()), channels[0])
+        if channel.get_busy():
+            self.interrupted += 1
+        channels.remove(channel)
+        channels.append(channel)
+
+        channel.play(self.sounds[name].load())
+
+    def report(self):
+        """Return how many sounds were played, skipped as too soon after a repeat, and cut off."""
+        return {'played': self.played, 'throttled': self.throttled, 'interrupted': self.interrupted}
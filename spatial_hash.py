@@ -0,0 +1,108 @@
+class SpatialHash:
+    """A uniform grid that buckets sprites by the cells their rects overlap (a collision broadphase)."""
+
+    def __init__(self, cell_size):
+        """Initialize an empty grid with square cells cell_size pixels wide."""
+        self.cell_size = max(int(cell_size), 1)
+        self.cells = {}
+        # The position of each sprite in its group, so results keep the group's order
+        self.order = {}
+        # The cells each sprite was bucketed in, so it can be taken out again
+        self.placed = {}
+
+        # How far every sprite has moved since the grid was built, and how far (in pixels) any one sprite
+        # may be from that, since each rounds its own position to whole pixels
+        self.offset_x = 0
+        self.offset_y = 0
+        self.slack = 0
+
+    def build(self, group):
+        """Bucket every sprite in group, replacing anything bucketed before."""
+        cell_size = self.cell_size
+        self.cells = cells = {}
+        self.order = order = {}
+        self.placed = placed = {}
+        self.offset_x = self.offset_y = self.slack = 0
+        for index, sprite in enumerate(group.sprites()):
+            order[sprite] = index
+            left, top, width, height = sprite.rect
+            first_x, last_x = left // cell_size, (left + width - 1) // cell_size
+            first_y, last_y = top // cell_size, (top + height - 1) // cell_size
+            if first_x == last_x and first_y == last_y:
+                # Most sprites are smaller than a cell and fit in just one
+                key = (first_x, first_y)
+                cells.setdefault(key, []).append(sprite)
+                placed[sprite] = (key,)
+                continue
+            keys = [(cell_x, cell_y) for cell_x in range(first_x, last_x + 1)
+                    for cell_y in range(first_y, last_y + 1)]
+            for key in keys:
+                cells.setdefault(key, []).append(sprite)
+            placed[sprite] = keys
+
+    def shift(self, dx, dy=0):
+        """
+        Account for every sprite in the grid having moved by (dx, dy), e.g. a whole fleet moving together,
+          without bucketing them again.
+        """
+        self.offset_x += dx
+        self.offset_y += dy
+        # Each sprite rounds its own exact position, so it may be a pixel either side of the shared offset
+        self.slack = 2
+
+    def remove(self, sprite):
+        """Take a sprite (e.g. one that was destroyed) out of the grid."""
+        for key in self.placed.pop(sprite, ()):
+            self.cells[key].remove(sprite)
+
+    def query(self, rect):
+        """Return the sprites sharing a cell with rect, in the order they appear in their group."""
+        cells = self.cells
+        found = []
+        for key in self._get_cells(rect):
+            cell = cells.get(key)
+            if cell:
+                found.extend(cell)
+
+        # Sprites spanning several cells are found more than once
+        if len(found) > 1:
+            found = sorted(set(found), key=self.order.__getitem__)
+        return found
+
+    def _get_cells(self, rect):
+        """Return the cells rect overlaps, as they were when the grid was built."""
+        cell_size = self.cell_size
+        # Look where rect would have been when the grid was built (allowing for each sprite's rounding)
+        slack = self.slack
+        left = rect.left - round(self.offset_x) - slack
+        right = rect.right - round(self.offset_x) + slack
+        top = rect.top - round(self.offset_y) - slack
+        bottom = rect.bottom - round(self.offset_y) + slack
+        return [(cell_x, cell_y) for cell_x in range(left // cell_size, (right - 1) // cell_size + 1)
+                for cell_y in range(top // cell_size, (bottom - 1) // cell_size + 1)]
+
+    def collide_any(self, sprite, group):
+        """Equivalent to pg.sprite.spritecollideany(sprite, group) for the group this grid was built from."""
+        for other in self.query(sprite.rect):
+            if other in group and sprite.rect.colliderect(other.rect):
+                return other
+        return None
+
+    def collide_group(self, groupa, groupb, dokilla, dokillb):
+        """
+        Equivalent to pg.sprite.groupcollide(groupa, groupb, dokilla, dokillb), where groupb is the group
+          this grid was built from. Sprites killed since the grid was built are skipped.
+        """
+        crashed = {}
+        for sprite in groupa.sprites():
+            collision = []
+            for other in self.query(sprite.rect):
+                if other in groupb and sprite.rect.colliderect(other.rect):
+                    if dokillb:
+                        other.kill()
+                    collision.append(other)
+            if collision:
+                crashed[sprite] = collision
+                if dokilla:
+                    sprite.kill()
+        return crashed
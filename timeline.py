@@ -0,0 +1,45 @@
+from constants import FPS, MAX_TICKS_PER_FRAME
+
+
+class Timeline:
+    """A single game clock that counts simulated frames, used for all animation and effect timing."""
+
+    def __init__(self):
+        """Start the timeline at frame zero."""
+        self.frame = 0
+
+    def advance(self):
+        """Move the timeline forward by one frame."""
+        self.frame += 1
+
+    def time_since(self, frame):
+        """Return the game time in milliseconds that has passed since frame."""
+        return (self.frame - frame) * 1000 / FPS
+
+
+class FixedTimestep:
+    """Converts the time between drawn frames into a whole number of fixed-length simulation ticks."""
+
+    def __init__(self, clock, render_fps):
+        """Initialize the accumulator of time not yet simulated."""
+        self.clock = clock
+        self.render_fps = render_fps
+        self.tick_length = 1000 / FPS
+        self.accumulator = 0
+
+    def tick(self):
+        """Wait for the next frame to draw and return how many simulation ticks should run before it."""
+        self.accumulator += self.clock.tick(self.render_fps)
+        ticks = int(self.accumulator // self.tick_length)
+
+        # Drop time that can't be caught up on rather than falling further and further behind
+        if ticks > MAX_TICKS_PER_FRAME:
+            ticks = MAX_TICKS_PER_FRAME
+            self.accumulator = 0
+        else:
+            self.accumulator -= ticks * self.tick_length
+        return ticks
+
+    def get_alpha(self):
+        """Return how far the next frame is between the last simulation tick and the next one (0 to 1)."""
+        return self.accumulator / self.tick_length
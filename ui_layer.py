@@ -0,0 +1,26 @@
+import pygame as pg
+
+from constants import UI_LAYER_COLORKEY
+
+
+class UILayer:
+    """Static UI elements rendered once into a single surface, so they're drawn with one blit."""
+
+    def __init__(self, elements):
+        """
+        Render elements, a list of (image, rect) pairs, into a surface covering all of them.
+          Anything between the elements is transparent.
+        """
+        rects = [rect for _, rect in elements]
+        self.rect = rects[0].unionall(rects[1:])
+
+        # A colorkeyed surface in the display's pixel format blits much faster than one with per-pixel alpha
+        self.image = pg.Surface(self.rect.size).convert()
+        self.image.fill(UI_LAYER_COLORKEY)
+        for image, rect in elements:
+            self.image.blit(image, rect.move(-self.rect.x, -self.rect.y))
+        self.image.set_colorkey(UI_LAYER_COLORKEY, pg.RLEACCEL)
+
+    def draw(self, surface):
+        """Draw the layer."""
+        surface.blit(self.image, self.rect)